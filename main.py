@@ -7,17 +7,48 @@ NQ Trading Calendar v2.4
 - Known Time + FF timezone auto-detection
 - Dual alarms: 30min before + 8:30 AM ET
 - Fed Chair future-proof
+- Actual/Forecast/Previous + release-day 폴링 (python main.py release)
+- 서브커맨드 (scrape-ff / earnings / render / serve) + lazy import
+- EventSource 플러그인 (ff / earnings / opex / csv) 병렬 수집 + merge
+- NQEvent (__slots__) — HKT / 설명은 렌더 시 lazy 계산
+- TzTable: 연도별 DST 전환표로 ET/HKT 일괄 변환
+- backfill: 과거 월 페이지 → 컬럼형 DataFrame (프로세스 풀 파싱)
+- FF 수집: 스트리밍 다운로드 + 증분 HTML 파싱 (DOM 없이 행 단위) — 파싱은 워커 프로세스 (청크를 pipe 로 바로 넘김)
+- 페이지 소유권: 각 날짜는 그 달 페이지만 파싱 (spill-over 중복 없음, 페이지 독립)
+- FF timezone 보정 단계: 전 페이지 Known Time 행으로 FF 표시 zone 감지 (DST 반영, + store 캐시) → 페이지별 순수 변환
+- 여러 runner 협업 (--shared DIR): 월 페이지 lease (만료 시 회수) → 페이지당 1회 다운로드, 결과 공유
+- FF egress 풀 (NQ_FF_PROXIES): 건강 점수 가중 선택 + circuit breaker, endpoint 수만큼 병렬
+- yfinance: 공유 세션 (keep-alive, crumb 재사용) + 시가총액 / 실적일 캐시 (만료별), 병렬 조회
+- 거래 세션 색인 (NYSE 휴장 / 조기 폐장 + Globex, 규칙 생성 bytearray): 장준비 알람 / 실적 / OPEX 날짜 검증, Globex 시간 외 발표 표시
+- EventIndex: 시각 정렬 배열 + 그룹 / tier 보조 색인 — 구간 / 다음 N 개 O(log n + k), store 변경분만 반영
+- SQLite store (FF 원본 행 + 이벤트 + 변경 이력)
+- Change feed (changes.jsonl, seq / since) + 고정 VEVENT UID
+- 행 단위 memo (변경된 행만 매칭 / TZ 변환 / 설명 생성)
+- 다통화 / 다지역 (USD·EUR·GBP·JPY·CNY) 한 번 스캔, 지역 현지 시각 → ET
+- 실행 시간 예산 (--budget): 가까운 달 우선, 초과 시 남은 작업 취소 → 이전 데이터
+- 월별 last-good snapshot: 받기 / 파싱 실패한 달은 이전 데이터 + stale 표시
+- 원자적 배포 (tmp → fsync → rename) + .gz / .br + manifest, PUBLISH_DIRS 병렬
+- Freshness: 변경 감지 → 배포 지연 p50 / p95 / max (freshness, /metrics)
+- render-batch: 구독자별 ICS (시간대 / tier / 그룹 / 티커 / 알람), 시간대별 1회 계산
+- VEVENT fragment 캐시 (uid, 버전, 프로필) — 바뀐 이벤트만 재직렬화
 """
 
-import cloudscraper
-from bs4 import BeautifulSoup
-from ics import Calendar, Event
-from ics.alarm import DisplayAlarm
-from datetime import datetime, timedelta, time as dt_time, date
+# cloudscraper / yfinance / pandas 는 사용하는 함수 안에서 import
+# (render / serve 는 무거운 의존성 없이 바로 시작)
+from datetime import datetime, timedelta, timezone, time as dt_time, date
+from bisect import bisect_right
+from zoneinfo import ZoneInfo
+from html.parser import HTMLParser
+import argparse
+import calendar as calendar_module
+import codecs
+import json
+import math
+import os
 import pytz
-import yfinance as yf
-import pandas as pd
 import re
+import sys
+import threading
 import time as time_module
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -26,61 +57,443 @@ import time as time_module
 HKT = pytz.timezone('Asia/Hong_Kong')
 ET  = pytz.timezone('US/Eastern')
 OUTPUT_FILE = "trading_calendar.ics"
+DB_FILE     = "nq_events.db"        # SQLite store: scrape-ff / earnings 결과 → render / serve 입력
+CHANGES_FILE = "changes.jsonl"      # 렌더마다 추가/변경/삭제 delta (seq 단조 증가)
+SERVE_PORT  = 8000
+
+# 구독자별 ICS 일괄 렌더 (python main.py render-batch)
+SUBSCRIBERS_FILE = "subscribers.json"   # [{"id", "tz", "max_tier", "groups", "tickers", "pre_alarm_min", "prep_et"}, ...]
+BATCH_OUT_DIR    = "calendars"
 
 FUTURE_MONTHS = 3
 MAX_TIER      = 2
 MARKET_PREP_ET = dt_time(8, 30)
+SESSION_YEARS  = (2000, 2075)     # 거래 세션 색인 범위 (규칙으로 생성, 하루 1바이트)
 
 EARNINGS_CANDIDATES = ["AAPL", "NVDA", "MSFT", "GOOGL", "AMZN", "META", "TSLA"]
 EARNINGS_TOP_N = 3
 
-BLACKLIST = ["adp", "pce"]
+# yfinance: 공유 curl_cffi 세션 (스레드별 keep-alive) + store 캐시 (종류별 만료, 실행 간 재사용)
+YF_WORKERS   = 4
+YF_CACHE_DIR = "yf_cache"           # yfinance 쿠키 / tz 캐시 (crumb 재사용)
+YF_CACHE_TTL = {"market_cap": 24 * 3600, "earnings_date": 6 * 3600}
 
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# NQ ESSENTIAL EVENTS
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-EVENTS_DEF = [
-    {"match": ["federal funds rate"],
-     "group": "fomc", "display": "FOMC Rate Decision",
-     "emoji": "🔴", "time_et": (14, 0), "tier": 1},
+BLACKLIST = ["adp", "pce"]
 
-    {"match": ["fomc press conference"],
-     "group": "fomc_pc", "display": "FOMC Press Conference",
-     "emoji": "🎙️", "time_et": (14, 30), "tier": 1},
+# Release-day 폴링 (python main.py release)
+# 중단 조건: ① 슬롯의 모든 지표 actual 확인 ② 발표 후 RELEASE_TIMEOUT_MIN 경과 ③ Ctrl+C
+RELEASE_POLL_SEC    = 5
+RELEASE_LEAD_MIN    = 2
+RELEASE_TIMEOUT_MIN = 20
+
+# 서브커맨드별 무거운 의존성 (bench-startup 측정 대상)
+COMMAND_DEPS = {
+    "scrape-ff": ["cloudscraper"],
+    "earnings":  ["yfinance", "pandas"],
+    "render":    [],
+    "serve":     [],
+}
+STARTUP_BUDGET_MS = {"render": 300, "serve": 100}   # CI runner 기준 여유
 
-    {"match": ["cpi m/m", "cpi y/y", "core cpi"],
-     "group": "cpi", "display": "CPI Release",
-     "emoji": "🔥", "time_et": (8, 30), "tier": 1},
+# 렌더 결과 배포 위치 (각각 .ics + .gz / .br + manifest, 원자적 교체)
+PUBLISH_DIRS  = ["."]
+MANIFEST_FILE = "manifest.json"
 
-    {"match": ["non-farm employment change"],
-     "group": "nfp", "display": "NFP + Unemployment",
-     "emoji": "💼", "time_et": (8, 30), "tier": 1},
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# NQ ESSENTIAL EVENTS (통화별, "time" = 지역 현지 발표 시각)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+REGIONS = {
+    "USD": "America/New_York",
+    "EUR": "Europe/Berlin",
+    "GBP": "Europe/London",
+    "JPY": "Asia/Tokyo",
+    "CNY": "Asia/Shanghai",
+}
 
-    {"match": ["unemployment rate"],
-     "group": "nfp", "display": "NFP + Unemployment",
-     "emoji": "💼", "time_et": (8, 30), "tier": 1},
+EVENTS_DEF = {
+    "USD": [
+        {"match": ["federal funds rate"],
+         "group": "fomc", "display": "FOMC Rate Decision",
+         "emoji": "🔴", "time": (14, 0), "tier": 1},
+
+        {"match": ["fomc press conference"],
+         "group": "fomc_pc", "display": "FOMC Press Conference",
+         "emoji": "🎙️", "time": (14, 30), "tier": 1},
+
+        {"match": ["cpi m/m", "cpi y/y", "core cpi"],
+         "group": "cpi", "display": "CPI Release",
+         "emoji": "🔥", "time": (8, 30), "tier": 1},
+
+        {"match": ["non-farm employment change"],
+         "group": "nfp", "display": "NFP + Unemployment",
+         "emoji": "💼", "time": (8, 30), "tier": 1},
+
+        {"match": ["unemployment rate"],
+         "group": "nfp", "display": "NFP + Unemployment",
+         "emoji": "💼", "time": (8, 30), "tier": 1},
+
+        {"match": ["fed chair"],
+         "also_require": ["speaks", "testifies"],
+         "group": "fedchair", "display": "Fed Chair Speaks",
+         "emoji": "🗣️", "time": None, "tier": 1, "dedup": "day"},
+
+        {"match": ["ism services pmi"],
+         "group": "ism_svc", "display": "ISM Services PMI",
+         "emoji": "⚡", "time": (10, 0), "tier": 2},
+    ],
+    "EUR": [
+        {"match": ["main refinancing rate"],
+         "group": "ecb", "display": "ECB Rate Decision",
+         "emoji": "🇪🇺", "time": (14, 15), "tier": 2},
+
+        {"match": ["ecb press conference"],
+         "group": "ecb_pc", "display": "ECB Press Conference",
+         "emoji": "🇪🇺", "time": (14, 45), "tier": 2},
+    ],
+    "GBP": [
+        {"match": ["cpi y/y"],
+         "group": "uk_cpi", "display": "UK CPI",
+         "emoji": "🇬🇧", "time": (7, 0), "tier": 2},
+    ],
+    "JPY": [
+        {"match": ["boj policy rate"],
+         "group": "boj", "display": "BoJ Rate Decision",
+         "emoji": "🇯🇵", "time": None, "tier": 2},
+    ],
+    "CNY": [
+        {"match": ["manufacturing pmi"],
+         "group": "cn_pmi", "display": "China Manufacturing PMI",
+         "emoji": "🇨🇳", "time": (9, 30), "tier": 2},
+    ],
+}
 
-    {"match": ["fed chair"],
-     "also_require": ["speaks", "testifies"],
-     "group": "fedchair", "display": "Fed Chair Speaks",
-     "emoji": "🗣️", "time_et": None, "tier": 1},
+# 월 1회 그룹 (같은 달 중복 → 마지막 날짜 유지). 그 외 그룹은 (날짜, 그룹) 기준.
+MONTHLY_GROUPS = {
+    cfg["group"] for defs in EVENTS_DEF.values() for cfg in defs
+    if cfg.get("dedup") != "day"
+}
 
-    {"match": ["ism services pmi"],
-     "group": "ism_svc", "display": "ISM Services PMI",
-     "emoji": "⚡", "time_et": (10, 0), "tier": 2},
-]
+# 이벤트 소스 (병렬 수집, 등록 순서 = merge 순서)
+SOURCES = ["ff", "earnings", "opex", "csv"]
+EXTRA_EVENTS_CSV = "extra_events.csv"   # date,time_et,group,display,emoji,tier (Fed 연설, 국채 입찰 등)
+STREAM_CHUNK     = 16 * 1024            # FF 페이지 스트리밍 청크 (bytes)
+PARSE_WORKERS    = None                 # FF 페이지 파싱 프로세스 수 (None = CPU 수, 0 = 받는 스레드에서 바로 파싱)
+
+# 여러 호스트 협업 수집 (--shared DIR / NQ_SHARED_DIR): 월 페이지를 lease 로 나눠 갱신마다 한 번씩만 받음
+SHARED_DIR         = os.environ.get("NQ_SHARED_DIR")
+LEASE_SEC          = 120        # lease 만료 — 죽은 runner 가 잡은 달은 그 뒤 다른 runner 가 회수
+SHARED_REFRESH_SEC = 30 * 60    # 이보다 새 공유 결과는 다시 받지 않음 (갱신 주기)
+SHARED_FAIL_SEC    = 60         # 받기 실패 기록 유효 시간 — 지나면 다른 runner 가 lease 를 잡고 다시 받음
+LEASE_POLL_SEC     = 2
+
+# FF egress 풀 (NQ_FF_PROXIES="http://p1:3128,http://p2:3128,direct"): 비어 있으면 단일 세션
+FF_PROXIES          = [p.strip() for p in os.environ.get("NQ_FF_PROXIES", "").split(",") if p.strip()]
+EGRESS_EWMA         = 0.3     # 건강 점수 (지연 / 오류율 / 챌린지율) 갱신 비중
+EGRESS_BREAK_FAILS  = 3       # 연속 실패 → circuit open
+EGRESS_COOLDOWN_SEC = 120     # open 유지 시간 → 이후 시험 요청 1건
+EGRESS_ATTEMPTS     = 2       # 달 하나당 서로 다른 endpoint 로 시도 횟수
+
+# 실행 시간 예산 (collect 전체 마감). 넘으면 남은 작업 (먼 달 / 실적) 취소 → store 의 이전 데이터 사용
+RUN_BUDGET_SEC   = 300
+HTTP_TIMEOUT_SEC = 15
+DEADLINE_GRACE_SEC = 10     # 마감 전 새 작업 시작을 멈추는 여유 (진행 중 요청 / 마무리) — 예산의 1/4 이하
 
 MONTH_MAP = {
     'jan':1,'feb':2,'mar':3,'apr':4,'may':5,'jun':6,
     'jul':7,'aug':8,'sep':9,'oct':10,'nov':11,'dec':12
 }
 
+# 월 이름 명시 매칭 (요일 Fri/Thu 등과 혼동 방지, 대소문자 무관)
+DATE_RE = re.compile(
+    r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s*(\d{1,2})',
+    re.IGNORECASE
+)
+
+# 과거 데이터 백필 (python main.py backfill --from 2015-01 --to 2026-10)
+BACKFILL_DIR = "ff_archive"          # 월 페이지 원본 (gzip)
+BACKFILL_OUT = "ff_backfill"         # .parquet (pyarrow 있으면) / .csv
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# TIMEZONE TABLES (연도별 UTC offset 전환표)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_EPOCH = datetime(1970, 1, 1)
+
+
+class TzTable:
+    """
+    zoneinfo 에서 연도별 DST 전환 시각을 한 번 뽑아두고
+    이후 변환은 bisect + 덧셈만. 결과 tzinfo 는 고정 offset (이름 EDT/EST 유지).
+
+    벽시계 → UTC 규칙은 pytz localize(is_dst=False) 와 동일:
+    - 없는 시각 (3월 02:30) → 표준시 offset (= 03:30 EDT)
+    - 겹치는 시각 (11월 01:30) → 표준시 offset (두 번째 01:30)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # (y0, y1, 구간 시작 UTC 초, offset 초, 구간 시작 벽시계 초, 고정 offset tzinfo)
+        # 새로 만든 표는 통째로 한 번에 교체 — 여러 스레드가 읽어도 서로 다른 빌드가 섞이지 않음
+        self._table = None
+        self._lock = threading.Lock()
+
+    def _build(self, y0: int, y1: int) -> tuple:
+        zone = ZoneInfo(self.name)
+
+        def info(ts):
+            d = datetime.fromtimestamp(ts, zone)
+            return int(d.utcoffset().total_seconds()), d.tzname()
+
+        ts  = calendar_module.timegm((y0, 1, 1, 0, 0, 0))
+        end = calendar_module.timegm((y1 + 1, 1, 1, 0, 0, 0))
+        starts, infos = [ts], [info(ts)]
+        while ts < end:
+            nxt = ts + 86400
+            cur = info(nxt)
+            if cur != infos[-1]:
+                lo, hi = ts, nxt           # 전환 시각 이분 탐색 (초 단위)
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if info(mid) == infos[-1]:
+                        lo = mid
+                    else:
+                        hi = mid
+                starts.append(hi)
+                infos.append(cur)
+            ts = nxt
+
+        return (
+            y0, y1, starts,
+            [off for off, _ in infos],
+            [t + off for t, (off, _) in zip(starts, infos)],
+            [timezone(timedelta(seconds=off), abbr) for off, abbr in infos],
+        )
+
+    def _ensure(self, lo_year: int, hi_year: int) -> tuple:
+        """lo_year ~ hi_year 를 덮는 표 (필요하면 넓혀서 다시 만듦). 호출자는 반환된 표만 사용."""
+        table = self._table
+        if table is not None and table[0] < lo_year and hi_year < table[1]:
+            return table
+        with self._lock:
+            table = self._table
+            if table is None:
+                y0, y1 = lo_year - 1, hi_year + 1
+            elif table[0] < lo_year and hi_year < table[1]:
+                return table
+            else:
+                y0, y1 = min(table[0], lo_year - 1), max(table[1], hi_year + 1)
+            self._table = table = self._build(y0, y1)
+            return table
+
+    @staticmethod
+    def _wall_index(table: tuple, wall: int) -> int:
+        """벽시계 초 → 적용 구간 index (pytz is_dst=False 규칙)."""
+        _, _, starts, offs, wall_starts, _ = table
+        i = bisect_right(wall_starts, wall) - 1
+        valid = i < 0 or i + 1 >= len(starts) or wall < starts[i + 1] + offs[i]
+        if not valid:
+            # 없는 시각 (spring forward) → 전/후 중 표준시 (작은 offset)
+            return i if offs[i] <= offs[i + 1] else i + 1
+        if i > 0 and wall < starts[i] + offs[i - 1]:
+            # 겹치는 시각 (fall back) → 표준시 (작은 offset)
+            return i if offs[i] <= offs[i - 1] else i - 1
+        return max(i, 0)
+
+    def localize_many(self, naives) -> list:
+        """벽시계 naive datetime 들 → aware datetime 리스트 (한 번에)."""
+        naives = list(naives)
+        if not naives:
+            return []
+        table = self._ensure(min(naives).year, max(naives).year)
+        offs = table[3]
+        out = []
+        for n in naives:
+            wall = calendar_module.timegm(n.timetuple())
+            out.append(self._from_utc(table, wall - offs[self._wall_index(table, wall)]))
+        return out
+
+    def localize(self, naive: datetime) -> datetime:
+        return self.localize_many([naive])[0]
+
+    @staticmethod
+    def _from_utc(table: tuple, utc: int) -> datetime:
+        i = bisect_right(table[2], utc) - 1
+        return datetime.fromtimestamp(utc, table[5][i])
+
+    def convert_many(self, aware_dts) -> list:
+        """aware datetime 들 → 이 zone 시각 리스트 (한 번에)."""
+        utcs = [int(d.timestamp()) for d in aware_dts]
+        if not utcs:
+            return []
+        table = self._ensure((_EPOCH + timedelta(seconds=min(utcs))).year,
+                             (_EPOCH + timedelta(seconds=max(utcs))).year)
+        return [self._from_utc(table, u) for u in utcs]
+
+    def convert(self, aware_dt: datetime) -> datetime:
+        return self.convert_many([aware_dt])[0]
+
+    def std_hours(self) -> int:
+        """표준시 UTC offset (시간, 1월 기준)."""
+        return int(datetime(2000, 1, 15, tzinfo=ZoneInfo(self.name)).utcoffset().total_seconds()) // 3600
+
+
+ET_TZ  = TzTable('America/New_York')
+HKT_TZ = TzTable('Asia/Hong_Kong')
+REGION_TZ = {cur: ET_TZ if name == ET_TZ.name else TzTable(name) for cur, name in REGIONS.items()}
+_TZ_TABLES = {t.name: t for t in (ET_TZ, HKT_TZ, *REGION_TZ.values())}
+
+
+def tz_table(name: str) -> TzTable:
+    """이름별 TzTable (한 번 만든 전환표 재사용)."""
+    if name not in _TZ_TABLES:
+        ZoneInfo(name)    # 없는 이름이면 여기서 ZoneInfoNotFoundError
+        _TZ_TABLES[name] = TzTable(name)
+    return _TZ_TABLES[name]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# TRADING SESSIONS (NYSE 휴장 / 조기 폐장 + CME Globex)
+# 규칙으로 로컬 생성 (네트워크 없음) → 날짜별 상태 코드 bytearray, ordinal 인덱스로 O(1) 조회
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SESSION_OPEN    = 0   # 정규장 (NYSE 09:30–16:00, Globex ~17:00 ET)
+SESSION_WEEKEND = 1
+SESSION_HOLIDAY = 2   # NYSE 휴장, Globex 13:00 ET 조기 정지 (MLK / 현충일 / 추수감사절 등)
+SESSION_CLOSED  = 3   # NYSE / Globex 모두 휴장 (새해 / 성금요일 / 성탄절)
+SESSION_EARLY   = 4   # NYSE 13:00 ET 조기 폐장, Globex 13:15 ET
+
+SESSION_NOTES = {
+    SESSION_HOLIDAY: "🏖️ 미국 증시 휴장 (Globex 13:00 ET 조기 정지)",
+    SESSION_CLOSED:  "🏖️ 미국 증시 / Globex 휴장",
+    SESSION_EARLY:   "⏰ 미국 증시 조기 폐장 13:00 ET (Globex 13:15 ET)",
+}
+GLOBEX_OPEN_ET = dt_time(18, 0)     # 전날 18:00 ET 에 다음 거래일 세션 시작
+GLOBEX_CLOSE_ET = {SESSION_OPEN: dt_time(17, 0), SESSION_HOLIDAY: dt_time(13, 0), SESSION_EARLY: dt_time(13, 15)}
+
+
+def easter(y: int) -> date:
+    """부활절 (그레고리력, Anonymous Gregorian algorithm)."""
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(y, month, day + 1)
+
+
+def nth_weekday(y: int, m: int, weekday: int, n: int) -> date:
+    """m 월의 n 번째 weekday (n = -1 이면 마지막)."""
+    if n > 0:
+        first = date(y, m, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(y, m, calendar_module.monthrange(y, m)[1])
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed(d: date) -> date:
+    """토요일 → 금요일, 일요일 → 월요일."""
+    return d + timedelta(days={5: -1, 6: 1}.get(d.weekday(), 0))
+
+
+def nyse_calendar(y: int) -> dict:
+    """y 년 NYSE 규칙 휴장 / 조기 폐장 {date: 상태 코드} (임시 휴장은 규칙 밖이라 제외)."""
+    days = {}
+    new_year = date(y, 1, 1)
+    if new_year.weekday() != 5:          # 토요일이면 전년 12/31 대체 휴장 없음
+        days[observed(new_year)] = SESSION_CLOSED
+    if y >= 1998:
+        days[nth_weekday(y, 1, 0, 3)] = SESSION_HOLIDAY     # MLK
+    days[nth_weekday(y, 2, 0, 3)] = SESSION_HOLIDAY         # Presidents
+    days[easter(y) - timedelta(days=2)] = SESSION_CLOSED    # Good Friday
+    days[nth_weekday(y, 5, 0, -1)] = SESSION_HOLIDAY        # Memorial
+    if y >= 2022:
+        days[observed(date(y, 6, 19))] = SESSION_HOLIDAY    # Juneteenth
+    days[observed(date(y, 7, 4))] = SESSION_HOLIDAY
+    days[nth_weekday(y, 9, 0, 1)] = SESSION_HOLIDAY         # Labor
+    thanksgiving = nth_weekday(y, 11, 3, 4)
+    days[thanksgiving] = SESSION_HOLIDAY
+    days[observed(date(y, 12, 25))] = SESSION_CLOSED
+
+    # 조기 폐장: 독립기념일 전날 / 추수감사절 다음날 / 성탄 전야 (평일이고 휴장일이 아닐 때)
+    for d in (date(y, 7, 3), thanksgiving + timedelta(days=1), date(y, 12, 24)):
+        if d.weekday() < 5 and d not in days:
+            days[d] = SESSION_EARLY
+    return days
+
+
+class SessionIndex:
+    """SESSION_YEARS 범위 날짜 → 상태 코드 (bytearray, 하루 1바이트)."""
+
+    __slots__ = ("base", "codes")
+
+    def __init__(self, first_year: int, last_year: int):
+        start = date(first_year, 1, 1)
+        self.base = start.toordinal()
+        codes = bytearray(date(last_year, 12, 31).toordinal() - self.base + 1)
+        for wd in (5, 6):
+            first = (wd - start.weekday()) % 7
+            codes[first::7] = bytes([SESSION_WEEKEND]) * len(range(first, len(codes), 7))
+        for y in range(first_year, last_year + 1):
+            for d, code in nyse_calendar(y).items():
+                i = d.toordinal() - self.base
+                if 0 <= i < len(codes):
+                    codes[i] = code
+        self.codes = codes
+
+    def code(self, d: date) -> int:
+        i = d.toordinal() - self.base
+        if 0 <= i < len(self.codes):
+            return self.codes[i]
+        return SESSION_WEEKEND if d.weekday() >= 5 else SESSION_OPEN
+
+
+_SESSIONS = None
+
+
+def session_code(d: date) -> int:
+    global _SESSIONS
+    if _SESSIONS is None:
+        _SESSIONS = SessionIndex(*SESSION_YEARS)
+    return _SESSIONS.code(d)
+
+
+def is_trading_day(d: date) -> bool:
+    """NYSE 개장일 (조기 폐장 포함)."""
+    return session_code(d) in (SESSION_OPEN, SESSION_EARLY)
+
+
+def trading_day_on_or_after(d: date, step: int = 1) -> date:
+    """d 가 휴장이면 다음 (step = -1 이면 이전) 개장일."""
+    while not is_trading_day(d):
+        d += timedelta(days=step)
+    return d
+
+
+def globex_session(d: date):
+    """거래일 d 의 Globex 세션 (시작, 종료) ET aware — 휴장이면 None."""
+    close = GLOBEX_CLOSE_ET.get(session_code(d))
+    if close is None:
+        return None
+    start = ET_TZ.localize(datetime.combine(d - timedelta(days=1), GLOBEX_OPEN_ET))
+    return start, ET_TZ.localize(datetime.combine(d, close))
+
+
+def in_globex_session(t: datetime) -> bool:
+    """ET aware 시각 t 에 Globex (NQ) 가 거래 중인지 — 18:00 이후는 다음 거래일 세션."""
+    for d in (t.date(), t.date() + timedelta(days=1)):
+        session = globex_session(d)
+        if session and session[0] <= t < session[1]:
+            return True
+    return False
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # HELPERS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def match_event(name_lower: str):
-    for cfg in EVENTS_DEF:
+def match_event(name_lower: str, currency: str = "USD"):
+    for cfg in EVENTS_DEF.get(currency, ()):
         if cfg["tier"] > MAX_TIER:
             continue
         if any(kw in name_lower for kw in cfg["match"]):
@@ -92,6 +505,66 @@ def match_event(name_lower: str):
     return None
 
 
+# 행 단위 memo — 내용이 같은 행은 매칭 / 시간 파싱 / TZ 변환 / 설명 생성 생략
+# (daemon / release-day 폴링처럼 같은 페이지를 반복 처리할 때)
+_ROW_MEMO   = {}   # (ff_date, currency, ff_name, time_text) → (scanned, cfg, ff_h, ff_m, ff_ok)
+_EVENT_MEMO = {}   # row_hash (후보 행 내용) → NQEvent — store 의 ff_event_memo 로 실행 간 유지
+
+
+def row_hash(candidate: tuple) -> str:
+    """page_candidates 후보 → 내용 hash (행 키, 벽시계 + zone, 수치, stale, 매칭 cfg)."""
+    import hashlib
+
+    naive, cfg, _, _, values, _, row_key, zone, stale = candidate
+    key = [row_key[0].isoformat(), *row_key[1:], zone, naive.isoformat(), *values, stale,
+           cfg["group"], cfg["display"], cfg["emoji"], cfg["tier"], cfg["time"]]
+    return hashlib.sha1(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def classify_row(key: tuple) -> tuple:
+    """FF 행 → (스캔 대상 통화?, 매칭 cfg, ff_h, ff_m, ff_ok). memo 우선."""
+    hit = _ROW_MEMO.get(key)
+    if hit is not None:
+        return hit
+    _, currency, event_name, time_text = key
+    event_lower = event_name.lower()
+    if currency not in EVENTS_DEF or any(bl in event_lower for bl in BLACKLIST):
+        hit = (False, None, 10, 0, False)
+    else:
+        hit = (True, match_event(event_lower, currency), *parse_ff_time(time_text))
+    _ROW_MEMO[key] = hit
+    return hit
+
+
+# FF 표시 zone 후보 (앞쪽 우선 — 맞는 행 수가 같으면 지역 zone 이 고정 offset 보다 먼저)
+FF_ZONE_CANDIDATES = list(dict.fromkeys([
+    ET_TZ.name, *REGIONS.values(), HKT_TZ.name, "UTC",
+    *(f"Etc/GMT{-h:+d}" for h in range(-12, 15)),      # Etc/GMT-8 = UTC+8 (부호 반대)
+]))
+
+
+def region_date(known: tuple, currency: str, ff_date: date, ff_zone: str) -> date:
+    """Known Time 지표의 지역 현지 날짜 — 그날 발표 시각이 FF zone 에서 ff_date 로 보이는 날 (DST 반영)."""
+    for days in (0, 1, -1):
+        d = ff_date - timedelta(days=days)
+        begin = REGION_TZ[currency].localize(datetime.combine(d, dt_time(*known)))
+        if tz_table(ff_zone).convert(begin).date() == ff_date:
+            return d
+    return ff_date
+
+
+def region_local_time(cfg: dict, currency: str, ff_date: date,
+                      ff_h: int, ff_m: int, ff_ok: bool, ff_zone: str) -> tuple:
+    """FF 행 → (벽시계 naive, 그 벽시계의 zone 이름). ff_zone = calibrate_ff_zone 결과."""
+    if cfg["time"] is not None:
+        d = region_date(cfg["time"], currency, ff_date, ff_zone)
+        return datetime.combine(d, dt_time(*cfg["time"])), REGIONS[currency]
+    if ff_ok:
+        # 시간 미정 지표: FF 벽시계 그대로 — FF zone 에서 UTC 로 (호출 측 localize)
+        return datetime.combine(ff_date, dt_time(ff_h, ff_m)), ff_zone
+    return datetime.combine(ff_date, dt_time(10, 0)), REGIONS[currency]
+
+
 def parse_ff_time(time_str: str):
     s = time_str.strip().lower()
     if not s or 'day' in s or 'tentative' in s:
@@ -107,19 +580,380 @@ def parse_ff_time(time_str: str):
     return (h, mn, True)
 
 
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 1. FOREXFACTORY SCRAPER
-# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def fetch_forex_events() -> list:
-    print("\n🔍 [1] ForexFactory 경제 지표 수집...")
-    scraper = cloudscraper.create_scraper()
+def ff_month_url(year: int, month: int) -> str:
+    label = date(year, month, 1).strftime("%b.%Y").lower()
+    return f"https://www.forexfactory.com/calendar?month={label}"
+
+
+def format_desc(evt: "NQEvent", local: datetime = None, local_label: str = "🇭🇰 HKT") -> str:
+    """설명 문자열. local / local_label: 구독자 시간대 (기본 HKT)."""
+    dt_et, dt_hkt = evt.begin_et, local or evt.begin_hkt
+    if evt.source == "earnings":
+        return (
+            f"{evt.name}\n"
+            f"⏰ ET: {dt_et.strftime('%Y-%m-%d %I:%M %p')}\n"
+            f"{local_label}: {dt_hkt.strftime('%Y-%m-%d %H:%M')}"
+        )
 
-    # 월 이름 명시 매칭 (요일 Fri/Thu 등과 혼동 방지, 대소문자 무관)
-    DATE_RE = re.compile(
-        r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s*(\d{1,2})',
-        re.IGNORECASE
+    label = "FF" if evt.source == "ff" else evt.source
+    lines = [
+        f"📌 {evt.display}",
+        f"📋 {label}: {evt.ff_name}",
+        f"⏰ ET: {dt_et.strftime('%Y-%m-%d %I:%M %p %Z')}",
+        f"{local_label}: {dt_hkt.strftime('%Y-%m-%d %H:%M %Z')}",
+        f"📊 Tier {evt.tier}",
+    ]
+    if evt.currency != "USD":
+        local = REGION_TZ[evt.currency].convert(dt_et)
+        lines.insert(2, f"🌐 {evt.currency} 현지: {local.strftime('%Y-%m-%d %H:%M %Z')}")
+    for name, actual, forecast, previous in evt.releases:
+        if actual or forecast or previous:
+            lines.append(
+                f"📈 {name}: A {actual or '-'} | F {forecast or '-'} | P {previous or '-'}"
+            )
+    note = SESSION_NOTES.get(session_code(evt.et_date))
+    if note:
+        lines.append(note)
+    if not in_globex_session(dt_et):
+        lines.append("🌙 Globex 거래 시간 외 발표 — NQ 반영은 다음 세션 (18:00 ET 개장)")
+    if evt.stale_since:
+        fetched = evt.stale_since[:16].replace("T", " ")
+        lines.append(f"⚠️ 이전 데이터 ({fetched} UTC 수집) — FF 갱신 실패, 다음 실행에서 재확인")
+    return "\n".join(lines)
+
+
+class NQEvent:
+    """
+    모든 소스 공통 이벤트 레코드.
+    ET 시각만 저장 — HKT 시각 / 설명 문자열은 렌더 시점에 계산 후 캐시.
+    """
+    __slots__ = (
+        "source", "group", "display", "emoji", "tier", "begin_et",
+        "ff_name", "ff_date", "timed", "pre_alarm", "releases", "currency",
+        "stale_since", "_begin_hkt", "_desc",
     )
 
+    def __init__(self, source: str, group: str, display: str, emoji: str,
+                 tier: int, begin_et: datetime, ff_name: str = "",
+                 timed: bool = True, pre_alarm: bool = True,
+                 releases=(), ff_date=None, currency: str = "USD", stale_since=None):
+        self.source    = source
+        self.group     = group
+        self.display   = display
+        self.emoji     = emoji
+        self.tier      = tier
+        self.begin_et  = begin_et
+        self.ff_name   = ff_name or display
+        self.ff_date   = ff_date
+        self.timed     = timed
+        self.pre_alarm = pre_alarm          # 30분 전 알람
+        self.releases  = tuple(releases)    # ((ff_name, actual, forecast, previous), ...)
+        self.currency  = currency           # 발표 지역 (REGIONS 키)
+        self.stale_since = stale_since      # snapshot 에서 복원된 경우 그 수집 시각 (UTC ISO)
+        self._begin_hkt = None
+        self._desc      = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.emoji} {self.display}"
+
+    @property
+    def et_date(self) -> date:
+        return self.begin_et.date()
+
+    @property
+    def begin_hkt(self) -> datetime:
+        if self._begin_hkt is None:
+            self._begin_hkt = HKT_TZ.convert(self.begin_et)
+        return self._begin_hkt
+
+    @property
+    def desc(self) -> str:
+        if self._desc is None:
+            self._desc = format_desc(self)
+        return self._desc
+
+    @property
+    def uid(self) -> str:
+        """안정 식별자 — dedup 키와 같은 규칙 (월 1회 그룹은 연-월, 그 외는 날짜)."""
+        d = self.et_date
+        if self.group in MONTHLY_GROUPS:
+            return f"{self.group}:{d.year:04d}-{d.month:02d}"
+        return f"{self.group}:{d.isoformat()}"
+
+    def set_releases(self, releases):
+        self.releases = tuple(releases)
+        self._desc = None
+
+    def with_releases(self, releases) -> "NQEvent":
+        evt = NQEvent(
+            self.source, self.group, self.display, self.emoji, self.tier,
+            self.begin_et, ff_name=self.ff_name, timed=self.timed,
+            pre_alarm=self.pre_alarm, releases=releases, ff_date=self.ff_date,
+            currency=self.currency, stale_since=self.stale_since,
+        )
+        evt._begin_hkt = self._begin_hkt
+        return evt
+
+    def to_json(self) -> dict:
+        return {
+            "source": self.source, "group": self.group,
+            "display": self.display, "emoji": self.emoji, "tier": self.tier,
+            "begin_et": self.begin_et.isoformat(),
+            "ff_name": self.ff_name,
+            "ff_date": self.ff_date.isoformat() if self.ff_date else None,
+            "timed": self.timed, "pre_alarm": self.pre_alarm,
+            "releases": [list(r) for r in self.releases],
+            "currency": self.currency,
+            "stale_since": self.stale_since,
+        }
+
+    @classmethod
+    def from_json(cls, d: dict) -> "NQEvent":
+        return cls(
+            d["source"], d["group"], d["display"], d["emoji"], d["tier"],
+            ET_TZ.convert(datetime.fromisoformat(d["begin_et"])),
+            ff_name=d["ff_name"], timed=d["timed"], pre_alarm=d["pre_alarm"],
+            releases=(tuple(r) for r in d["releases"]),
+            ff_date=date.fromisoformat(d["ff_date"]) if d.get("ff_date") else None,
+            currency=d.get("currency", "USD"),
+            stale_since=d.get("stale_since"),
+        )
+
+
+def dedup_key(evt: "NQEvent") -> tuple:
+    d = evt.et_date
+    if evt.group in MONTHLY_GROUPS:
+        return (d.year, d.month, evt.group)
+    return (d, evt.group)
+
+
+# 실행 마감 (time.monotonic 기준, None = 무제한) — 수집 루프가 작업 단위마다 확인
+# time_left() 는 새 작업을 시작할 수 있는 시간 (마감 - grace), grace 는 진행 중 요청 / 마무리 몫
+_DEADLINE = None
+_GRACE = 0.0
+
+
+def set_deadline(seconds):
+    global _DEADLINE, _GRACE
+    _DEADLINE = time_module.monotonic() + seconds if seconds else None
+    _GRACE = min(DEADLINE_GRACE_SEC, seconds / 4) if seconds else 0.0
+
+
+def time_left() -> float:
+    return float("inf") if _DEADLINE is None else _DEADLINE - _GRACE - time_module.monotonic()
+
+
+def join_by_deadline(threads: list) -> bool:
+    """
+    daemon 스레드들을 마감 (grace 포함) 까지만 기다림 → 전부 끝났으면 True.
+    grace 동안 소스는 진행 중인 요청을 끝내고 받은 만큼 반환 (새 작업은 time_left() 에서 멈춤).
+    못 끝난 스레드는 버려짐 (daemon 이라 프로세스 종료를 막지 않음 — executor 는 종료 시 join).
+    """
+    for t in threads:
+        left = time_left()
+        t.join(None if left == float("inf") else max(0.0, left + _GRACE))
+    return not any(t.is_alive() for t in threads)
+
+
+def http_timeout() -> float:
+    """요청 timeout — grace 의 절반까지만 (나머지 절반은 받은 페이지 마무리 몫)."""
+    return max(0.1, min(HTTP_TIMEOUT_SEC, time_left() + _GRACE / 2))
+
+
+def pace(seconds: float = 0.3):
+    """요청 간격 — 새 요청을 시작하지 않을 시점 (time_left() <= 0) 이면 기다리지 않음."""
+    time_module.sleep(max(0.0, min(seconds, time_left())))
+
+
+def merge_events(*event_lists) -> list:
+    """
+    소스 간 중복 제거.
+    - 월 1회 그룹: 같은 달 → 더 늦은 날짜 유지, 같은 날 → releases 합침
+    - 그 외: (날짜, 그룹) 첫 이벤트 유지
+    """
+    merged = {}
+    for events in event_lists:
+        for evt in events:
+            key = dedup_key(evt)
+            prev = merged.get(key)
+            if prev is None:
+                merged[key] = evt
+            elif evt.group in MONTHLY_GROUPS:
+                if evt.et_date > prev.et_date:
+                    merged[key] = evt
+                elif evt.et_date == prev.et_date and evt is not prev:
+                    known = {r[0] for r in prev.releases}
+                    extra = [r for r in evt.releases if r[0] not in known]
+                    if extra:
+                        # 입력 이벤트는 건드리지 않음 (행 memo 에서 재사용)
+                        merged[key] = prev.with_releases(prev.releases + tuple(extra))
+    return sorted(merged.values(), key=lambda x: x.begin_et)
+
+
+def merge_sources(events) -> list:
+    """여러 소스 이벤트 (store / 색인 조회) → 소스 등록 순서 (SOURCES) 대로 merge_events."""
+    by_source = {}
+    for evt in events:
+        by_source.setdefault(evt.source, []).append(evt)
+    order = {name: i for i, name in enumerate(SOURCES)}
+    return merge_events(*(by_source[s] for s in sorted(by_source, key=lambda s: (order.get(s, len(order)), s))))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 1. FOREXFACTORY SCRAPER
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+FF_ROW_COLUMNS = ["ff_date", "currency", "ff_name", "time_text", "actual", "forecast", "previous"]
+
+
+class FFRowStream(HTMLParser):
+    """
+    FF 캘린더 HTML 을 조각 (bytes) 단위로 받아 완성된 행만 내보냄.
+    DOM / 페이지 전체 문자열 없이 — 메모리 = 진행 중인 행 하나 + 완성된 행 튜플.
+    행 튜플 / 날짜 규칙은 FF_ROW_COLUMNS (날짜 셀은 앞으로만 이동, 연말/연초 spill-over 연도 보정).
+    페이지 소유권: 페이지 달의 날짜 행만 내보냄 — 앞뒤 달 spill-over 행은 날짜 셀에서
+    바로 판정해 나머지 셀은 모으지 않음 (같은 날짜를 두 페이지가 파싱 / 매칭하지 않음).
+    """
+
+    def __init__(self, page_year: int, page_month: int):
+        super().__init__(convert_charrefs=True)
+        self.page_year, self.page_month = page_year, page_month
+        self.found_table = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._depth = 0        # calendar__table 안 <table> 중첩 깊이 (0 = 테이블 밖)
+        self._in_row = False
+        self._open = []        # 열린 td/th [(tag, classes, texts)]
+        self._cells = []       # 이번 행의 닫힌 셀
+        self._cur_date = None
+        self._dated = False    # 이번 행에서 날짜 셀을 이미 봤는지
+        self._skip = False     # 이번 행이 다른 페이지 소유 → 셀 수집 중단
+        self._done = []
+        self._in_data = False  # 조각 경계로 나뉜 텍스트 이어붙이기
+
+    def feed(self, chunk: bytes) -> list:
+        """조각 입력 → 이번에 완성된 행들."""
+        super().feed(self._decoder.decode(chunk))
+        done, self._done = self._done, []
+        return done
+
+    def close(self) -> list:
+        super().feed(self._decoder.decode(b"", final=True))
+        super().close()
+        done, self._done = self._done, []
+        return done
+
+    def handle_starttag(self, tag, attrs):
+        self._in_data = False
+        if tag == "table":
+            if self._depth:
+                self._depth += 1
+            elif "calendar__table" in (dict(attrs).get("class") or "").split():
+                self._depth = 1
+                self.found_table = True
+        elif self._depth != 1:
+            return              # 테이블 밖 / 셀 안 중첩 테이블 (텍스트는 바깥 셀에 포함)
+        elif tag == "tr":
+            self._in_row, self._open, self._cells = True, [], []
+            self._dated = self._skip = False
+        elif tag in ("td", "th") and self._in_row and not self._skip:
+            self._open.append((tag, (dict(attrs).get("class") or "").split(), []))
+
+    def handle_endtag(self, tag):
+        self._in_data = False
+        if not self._depth:
+            return
+        if tag == "table":
+            self._depth -= 1
+        elif self._depth != 1:
+            return
+        elif tag in ("td", "th") and self._open:
+            cell = self._open.pop()
+            self._cells.append(cell)
+            if "calendar__date" in cell[1] and not self._open:
+                self._dated = True
+                self._advance_date(cell[2])
+                self._skip = self._cur_date is not None and not page_owns(
+                    self.page_year, self.page_month, self._cur_date)
+        elif tag == "tr" and self._in_row:
+            self._finish_row()
+            self._in_row = False
+
+    def handle_data(self, data):
+        for _, _, texts in self._open:      # 바깥 셀 텍스트에도 포함 (get_text 와 동일)
+            if self._in_data:
+                texts[-1] += data
+            else:
+                texts.append(data)
+        self._in_data = True
+
+    def _date_from(self, text: str):
+        dm = DATE_RE.search(text)
+        mn = MONTH_MAP.get(dm.group(1).lower()) if dm else None
+        if not mn:
+            return None
+        yr = self.page_year
+        if mn == 12 and self.page_month == 1:
+            yr -= 1
+        elif mn == 1 and self.page_month == 12:
+            yr += 1
+        try:
+            return date(yr, mn, int(dm.group(2)))
+        except ValueError:
+            return None
+
+    def _cell(self, cls: str) -> str:
+        for tag, classes, texts in self._cells:
+            if tag == "td" and cls in classes:
+                return "".join(t.strip() for t in texts)
+        return ""
+
+    def _advance_date(self, texts: list) -> bool:
+        """셀 텍스트에 날짜가 있으면 cur_date 갱신 (앞으로만)."""
+        candidate = self._date_from(" ".join(t.strip() for t in texts if t.strip()))
+        if candidate and (self._cur_date is None or candidate >= self._cur_date):
+            self._cur_date = candidate
+            return True
+        return False
+
+    def _finish_row(self):
+        if self._skip:
+            return
+        if not self._dated:
+            # calendar__date 셀이 없는 레이아웃 — 다른 셀 (event 제외) 에서 날짜 탐색
+            for tag, classes, texts in self._cells:
+                if "calendar__event" not in classes and self._advance_date(texts):
+                    break
+        if self._cur_date is None or not page_owns(self.page_year, self.page_month, self._cur_date):
+            return
+        currency, name = self._cell("calendar__currency"), self._cell("calendar__event")
+        if currency and name:
+            self._done.append((
+                self._cur_date, currency, name, self._cell("calendar__time"),
+                self._cell("calendar__actual"), self._cell("calendar__forecast"),
+                self._cell("calendar__previous"),
+            ))
+
+
+def page_owns(page_year: int, page_month: int, d: date) -> bool:
+    """날짜 d 를 처리하는 페이지는 그 달 페이지 하나 (spill-over 중복 파싱 방지)."""
+    return d.year == page_year and d.month == page_month
+
+
+def parse_page_rows(html, page_year: int, page_month: int) -> list:
+    """
+    월 / Day 페이지 HTML (bytes, 또는 bytes 조각 iterable) → 행 튜플 리스트 (FF_ROW_COLUMNS 순서).
+    상태 없는 순수 함수. 테이블 없으면 None.
+    """
+    stream = FFRowStream(page_year, page_month)
+    rows = []
+    for chunk in ([html] if isinstance(html, (bytes, str)) else html):
+        rows.extend(stream.feed(chunk.encode() if isinstance(chunk, str) else chunk))
+    rows.extend(stream.close())
+    return rows if stream.found_table else None
+
+
+def ff_months() -> list:
+    """수집할 달 — 우선순위 순 (이번 달 = 이번 주 포함 → 먼 달)."""
     now = datetime.now()
     months = []
     cur = date(now.year, now.month, 1)
@@ -128,309 +962,2599 @@ def fetch_forex_events() -> list:
         months.append((cur.year, cur.month))
         nxt = date(cur.year, cur.month, 1) + timedelta(days=32)
         cur = date(nxt.year, nxt.month, 1)
+    return months
+
+
+def parse_worker(inbox, outbox):
+    """
+    ParseWorkers 프로세스: (연, 월) → bytes 청크 … → b"" 순서로 받아 FFRowStream 에 넣고
+    완성된 행은 바로 돌려보냄 ((rows, None) … 마지막 (rows, found_table)). None → 종료.
+    """
+    while True:
+        ym = inbox.recv()
+        if ym is None:
+            return
+        stream = FFRowStream(*ym)
+        while True:
+            chunk = inbox.recv_bytes()
+            if not chunk:
+                break
+            rows = stream.feed(chunk)
+            if rows:
+                outbox.send((rows, None))
+        rows = stream.close()
+        outbox.send((rows, stream.found_table))
+
+
+class RemoteRowStream:
+    """
+    FFRowStream 과 같은 feed / close / found_table — 파싱은 워커 프로세스 (청크는 pipe 로 바로 넘김).
+    feed 는 그때까지 워커가 돌려보낸 행 (다운로드 중에 행 처리), close 는 남은 행.
+    부모는 페이지를 모아두지 않음 — pipe 가 차면 send 가 기다림 (메모리 일정).
+    """
+
+    def __init__(self, workers: "ParseWorkers", worker, ym: tuple):
+        self._workers, self._worker = workers, worker
+        self.found_table = False
+        worker.inbox.send(ym)
+
+    def _drain(self, block: bool) -> list:
+        import queue
+
+        rows = []
+        while self._worker is not None:
+            try:
+                done, found = self._worker.results.get(block=block)
+            except queue.Empty:
+                break
+            if isinstance(done, Exception):
+                self._worker = None      # 죽은 워커는 돌려놓지 않음
+                raise done
+            rows.extend(done)
+            if found is not None:
+                self.found_table = found
+                self._workers.release(self._worker)
+                self._worker = None
+        return rows
+
+    def feed(self, chunk: bytes) -> list:
+        if chunk:
+            self._worker.inbox.send_bytes(chunk)
+        return self._drain(block=False)
+
+    def close(self) -> list:
+        if self._worker is None:
+            return []
+        self._worker.inbox.send_bytes(b"")
+        return self._drain(block=True)
+
+    def abort(self):
+        """다운로드 실패 — 워커는 남은 입력을 끝내고 다음 페이지로 (결과는 버림)."""
+        try:
+            self.close()
+        except Exception:
+            pass
 
-    events_map = {}
-    scanned = 0
-    ff_tz_offset = None
-
-    for page_year, page_month in months:
-        label = date(page_year, page_month, 1).strftime("%b.%Y").lower()
-        url = f"https://www.forexfactory.com/calendar?month={label}"
-        print(f"   📡 {url}")
 
-        try:
-            resp = scraper.get(url, timeout=15)
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            table = soup.find('table', class_='calendar__table')
-            if not table:
-                print(f"      ⚠️ 테이블 없음")
-                continue
+class ParseWorkers:
+    """
+    FF 페이지 파싱 상주 프로세스 (PARSE_WORKERS) — 페이지 하나를 받는 동안 워커 하나 전용.
+    놀고 있는 워커가 없으면 호출한 스레드에서 바로 파싱 (FFRowStream).
+    """
+
+    def __init__(self, n: int):
+        import multiprocessing
+        import queue
+        from types import SimpleNamespace
+
+        self._idle = []
+        self._all = []
+        self._lock = threading.Lock()
+        for i in range(n):
+            inbox_r, inbox_w = multiprocessing.Pipe(duplex=False)
+            outbox_r, outbox_w = multiprocessing.Pipe(duplex=False)
+            proc = multiprocessing.Process(target=parse_worker, args=(inbox_r, outbox_w),
+                                           name=f"ff-parse-{i}", daemon=True)
+            proc.start()
+            inbox_r.close()
+            outbox_w.close()
+            worker = SimpleNamespace(proc=proc, inbox=inbox_w, results=queue.Queue())
+            # 결과 pipe 는 전용 스레드가 계속 비움 — 워커가 send 에서 막혀 입력을 못 읽는 일 없음
+            threading.Thread(target=self._pump, args=(outbox_r, worker.results),
+                             name=f"ff-parse-{i}-results", daemon=True).start()
+            self._idle.append(worker)
+            self._all.append(worker)
+
+    @staticmethod
+    def _pump(conn, results):
+        while True:
+            try:
+                results.put(conn.recv())
+            except (EOFError, OSError) as e:
+                results.put((RuntimeError(f"파싱 워커 종료: {e!r}"), None))
+                return
+
+    def release(self, worker):
+        with self._lock:
+            self._idle.append(worker)
+
+    def stream(self, ym: tuple):
+        """페이지용 행 스트림 — 워커가 있으면 RemoteRowStream, 없으면 FFRowStream."""
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        return FFRowStream(*ym) if worker is None else RemoteRowStream(self, worker, ym)
+
+    def close(self):
+        for worker in self._all:
+            try:
+                worker.inbox.send(None)
+                worker.inbox.close()
+            except OSError:
+                pass
+        for worker in self._all:
+            worker.proc.join(1.0)
+            if worker.proc.is_alive():
+                worker.proc.terminate()
+
+
+# fetch_ff_pages 동안만 — FF 페이지 파싱 워커 (PARSE_WORKERS)
+_PARSE_WORKERS = None
+
+
+def fetch_ff_page(scraper, ym: tuple, on_row=None, report=None):
+    """
+    월 페이지 하나를 스트리밍으로 받으며 청크마다 행 스트림에 넣음 (파싱 워커 또는 FFRowStream).
+    페이지 전체 문자열 / DOM 을 만들지 않음 (메모리 = 청크 + 행 튜플).
+    완성된 행은 바로 on_row(ym, row) 로 (다운로드 중에 행 처리 시작). 실패 / 테이블 없음 → None.
+    report(outcome): "ok" / "error" / "challenge" (테이블 없는 응답 = 차단 / 챌린지 페이지).
+    """
+    page_year, page_month = ym
+    url = ff_month_url(page_year, page_month)
+    print(f"   📡 {url}")
+    workers = _PARSE_WORKERS
+    stream = workers.stream(ym) if workers is not None else FFRowStream(page_year, page_month)
+    rows = []
+
+    def emit(done):
+        if on_row is not None:
+            for row in done:
+                on_row(ym, row)
+        rows.extend(done)
+
+    try:
+        with scraper.get(url, timeout=http_timeout(), stream=True) as resp:
+            for chunk in resp.iter_content(chunk_size=STREAM_CHUNK):
+                emit(stream.feed(chunk))
+        emit(stream.close())
+    except Exception as e:
+        if isinstance(stream, RemoteRowStream):
+            stream.abort()
+        print(f"      ❌ {page_year}-{page_month:02d}: {e}")
+        outcome, rows = "error", None
+    else:
+        if not stream.found_table:
+            print(f"      ⚠️ {page_year}-{page_month:02d}: 테이블 없음")
+            outcome, rows = "challenge", None
+        else:
+            outcome = "ok"
+    if report is not None:
+        report(outcome)
+    return rows
+
+
+def fetch_ff_pages(months: list, on_row=None):
+    """
+    월 페이지 → (ym, rows) yield (rows = None 이면 실패).
+    시간 예산이 끝나면 남은 (우선순위 낮은) 달은 받지 않음.
+    공유 디렉터리가 설정되면 runner 들이 lease 로 달을 나눠 받음 (shared_pages).
+    egress 풀이 설정되면 건강한 endpoint 들에 나눠 병렬로 받음 (EgressPool).
+    파싱은 ParseWorkers (동시에 받는 페이지 수만큼, 최대 PARSE_WORKERS) — 청크를 받는 대로 넘김.
+    """
+    global _PARSE_WORKERS
+
+    pool = egress_pool()
+    if pool is not None:
+        fetch = pool.fetch
+    else:
+        import cloudscraper
+
+        scraper = cloudscraper.create_scraper()
+
+        def fetch(ym, on_row=None):
+            return fetch_ff_page(scraper, ym, on_row)
+
+    if PARSE_WORKERS != 0:
+        concurrent = len(pool.endpoints) if pool is not None and not _SHARED_DIR else 1
+        _PARSE_WORKERS = ParseWorkers(min(PARSE_WORKERS or os.cpu_count() or 1, concurrent))
+    try:
+        if _SHARED_DIR:
+            yield from shared_pages(fetch, months, on_row)
+        elif pool is not None:
+            yield from pooled_pages(pool, months, on_row)
+        else:
+            yield from sequential_pages(fetch, months, on_row)
+    finally:
+        if _PARSE_WORKERS is not None:
+            _PARSE_WORKERS.close()
+            _PARSE_WORKERS = None
+    if pool is not None:
+        pool.print_health()
+
+
+def sequential_pages(fetch, months: list, on_row=None):
+    for i, ym in enumerate(months):
+        if time_left() <= 0:
+            skipped = ", ".join(f"{y}-{m:02d}" for y, m in months[i:])
+            print(f"   ⏭️ 시간 예산 초과 — 취소: {skipped} (이전 데이터 유지)")
+            return
+        yield ym, fetch(ym, on_row)
+        pace()
+
+
+# egress 풀 (FF_PROXIES): endpoint 별 건강 점수 → 가중 선택 + circuit breaker
+class Egress:
+    """프록시 / egress endpoint 하나 — 전용 cloudscraper 세션 + 최근 지연 / 오류율 / 챌린지율 (EWMA)."""
+
+    def __init__(self, url: str):
+        import cloudscraper
+        from urllib.parse import urlsplit
+
+        self.url = url
+        self.label = "direct" if url == "direct" else (urlsplit(url).netloc.rpartition("@")[2] or url)
+        self.scraper = cloudscraper.create_scraper()
+        if url != "direct":
+            self.scraper.proxies = {"http": url, "https": url}
+        self.latency = 1.0       # 초 (EWMA)
+        self.error_rate = 0.0
+        self.challenge_rate = 0.0
+        self.requests = 0
+        self.failures = 0        # 연속 실패 — EGRESS_BREAK_FAILS 이상이면 circuit open
+        self.open_until = 0.0    # monotonic — 지나면 half-open (시험 요청 1건)
+        self.busy = False
+
+    def weight(self) -> float:
+        return max(0.01, (1 - self.error_rate) * (1 - self.challenge_rate) / max(self.latency, 0.05))
+
+    def available(self, now: float) -> bool:
+        return not self.busy and now >= self.open_until
+
+    def record(self, outcome: str, seconds: float):
+        a = EGRESS_EWMA
+        self.requests += 1
+        self.latency += a * (seconds - self.latency)
+        self.error_rate += a * ((outcome == "error") - self.error_rate)
+        self.challenge_rate += a * ((outcome == "challenge") - self.challenge_rate)
+        if outcome == "ok":
+            self.failures = 0
+            self.open_until = 0.0
+        else:
+            self.failures += 1
+            if self.failures >= EGRESS_BREAK_FAILS:
+                self.open_until = time_module.monotonic() + EGRESS_COOLDOWN_SEC
+                print(f"      🚧 egress {self.label}: 연속 실패 {self.failures}회 — {EGRESS_COOLDOWN_SEC}s 차단")
+
+
+class EgressPool:
+    """
+    endpoint 하나당 동시에 요청 1건 (IP 별 요청 간격 유지) — 처리량은 건강한 endpoint 수만큼 늘어남.
+    선택은 건강 점수 가중 랜덤. circuit open 된 endpoint 는 cooldown 뒤 시험 요청 1건 (half-open).
+    """
+
+    def __init__(self, urls: list):
+        self.endpoints = [Egress(u) for u in urls]
+        self._cond = threading.Condition()
+
+    def _acquire(self, exclude=()):
+        """사용 가능한 endpoint 를 가중 선택 (바쁘면 대기). 전부 circuit open / 예산 초과 → None."""
+        import random
+
+        with self._cond:
+            while True:
+                now = time_module.monotonic()
+                ready = [e for e in self.endpoints if e.available(now) and e not in exclude]
+                if ready:
+                    ep = random.choices(ready, weights=[e.weight() for e in ready])[0]
+                    ep.busy = True
+                    return ep
+                live = [e for e in self.endpoints if e not in exclude and e.open_until <= now]
+                if not live or time_left() <= 0:
+                    return None
+                self._cond.wait(min(1.0, max(0.01, time_left())))
+
+    def _release(self, ep: "Egress"):
+        with self._cond:
+            ep.busy = False
+            self._cond.notify_all()
+
+    def fetch(self, ym: tuple, on_row=None):
+        """다른 endpoint 로 최대 EGRESS_ATTEMPTS 번. 쓸 수 있는 endpoint 없으면 None (→ snapshot)."""
+        tried = []
+        for _ in range(min(EGRESS_ATTEMPTS, len(self.endpoints))):
+            ep = self._acquire(tried)
+            if ep is None:
+                if not tried:
+                    print(f"      🚫 {ym[0]}-{ym[1]:02d}: 사용 가능한 egress 없음")
+                return None
+            tried.append(ep)
+            outcome = []
+            start = time_module.monotonic()
+            try:
+                rows = fetch_ff_page(ep.scraper, ym, on_row, report=outcome.append)
+                with self._cond:
+                    ep.record(outcome[0], time_module.monotonic() - start)
+                pace()
+            finally:
+                self._release(ep)
+            if rows is not None:
+                return rows
+        return None
+
+    def print_health(self):
+        for e in self.endpoints:
+            state = "open" if e.open_until > time_module.monotonic() else "closed"
+            print(f"   🌐 egress {e.label}: {e.requests}건, 지연 {e.latency:.2f}s, "
+                  f"오류 {e.error_rate:.0%}, 챌린지 {e.challenge_rate:.0%}, circuit {state}")
+
+
+_EGRESS = None
+
+
+def egress_pool():
+    """FF_PROXIES 설정 시 EgressPool (실행 동안 건강 점수 유지), 아니면 None."""
+    global _EGRESS
+    if _EGRESS is None and FF_PROXIES:
+        _EGRESS = EgressPool(FF_PROXIES)
+    return _EGRESS
+
+
+def pooled_pages(pool: "EgressPool", months: list, on_row=None):
+    """달을 우선순위 순으로 제출 → endpoint 수만큼 병렬, 끝나는 대로 yield."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def job(ym):
+        if time_left() <= 0:
+            return False
+        return pool.fetch(ym, on_row)
+
+    skipped = []
+    with ThreadPoolExecutor(max_workers=len(pool.endpoints)) as ex:
+        futures = {ex.submit(job, ym): ym for ym in months}
+        for f in as_completed(futures):
+            rows = f.result()
+            if rows is False:
+                skipped.append(futures[f])
+            else:
+                yield futures[f], rows
+    if skipped:
+        names = ", ".join(f"{y}-{m:02d}" for y, m in sorted(skipped))
+        print(f"   ⏭️ 시간 예산 초과 — 취소: {names} (이전 데이터 유지)")
 
-            cur_date = None
-
-            for row in table.find_all('tr'):
-                # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-                # 날짜 추출 (모든 행, 모든 셀)
-                # calendar__event 셀은 제외 (오탐 방지)
-                # cur_date는 앞으로만 이동 (FF는 시간순)
-                # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-                for cell in row.find_all(['td', 'th']):
-                    if 'calendar__event' in (cell.get('class') or []):
-                        continue
-                    cell_text = cell.get_text(" ", strip=True)
-                    dm = DATE_RE.search(cell_text)
-                    if dm:
-                        mn = MONTH_MAP.get(dm.group(1).lower())
-                        dn = int(dm.group(2))
-                        if mn:
-                            yr = page_year
-                            if mn == 12 and page_month == 1:
-                                yr -= 1
-                            elif mn == 1 and page_month == 12:
-                                yr += 1
-                            try:
-                                candidate = date(yr, mn, dn)
-                                if cur_date is None or candidate >= cur_date:
-                                    if candidate != cur_date:
-                                        print(f"      📅 {candidate}")
-                                    cur_date = candidate
-                                    break
-                            except ValueError:
-                                pass
-
-                if cur_date is None or cur_date < now.date():
-                    continue
 
-                # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-                # 이벤트 파싱 (이하 전부 동일)
-                # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-                cc = row.find('td', class_='calendar__currency')
-                ec = row.find('td', class_='calendar__event')
-                tc = row.find('td', class_='calendar__time')
+# 여러 runner 협업 수집 (공유 디렉터리)
+# pages/YYYY-MM.json  : 이번 갱신 주기의 결과 (rows = null 이면 받기 실패 — SHARED_FAIL_SEC 동안만 snapshot 사용)
+# leases/YYYY-MM.lock : 받는 중인 runner. mtime + LEASE_SEC 지나면 만료 → 다른 runner 가 회수
+_SHARED_DIR = SHARED_DIR
 
-                if not (cc and ec):
-                    continue
-                if cc.get_text(strip=True) != 'USD':
-                    continue
 
-                event_name = ec.get_text(strip=True)
-                event_lower = event_name.lower()
+def set_shared_dir(path):
+    global _SHARED_DIR
+    _SHARED_DIR = path or None
 
-                if any(bl in event_lower for bl in BLACKLIST):
-                    continue
 
-                scanned += 1
+def runner_id() -> str:
+    import socket
 
-                cfg = match_event(event_lower)
-                if not cfg:
-                    continue
+    return f"{socket.gethostname()}:{os.getpid()}"
 
-                tc_text = tc.get_text(strip=True) if tc else ""
-                ff_h, ff_m, ff_ok = parse_ff_time(tc_text)
 
-                if ff_tz_offset is None and cfg["time_et"] is not None and ff_ok:
-                    ff_tz_offset = (ff_h - cfg["time_et"][0]) % 24
-                    if ff_tz_offset == 0:
-                        print(f"   🕐 FF timezone = ET (offset 0h)")
-                    else:
-                        print(f"   🕐 FF timezone: ET+{ff_tz_offset}h")
-
-                et_date = cur_date
-
-                if cfg["time_et"] is not None:
-                    et_h, et_m = cfg["time_et"]
-                    if ff_ok:
-                        diff = ff_h - et_h
-                        if diff < -6:
-                            et_date = cur_date - timedelta(days=1)
-                    elif ff_tz_offset is not None:
-                        if cfg["time_et"][0] + ff_tz_offset >= 24:
-                            et_date = cur_date - timedelta(days=1)
-                else:
-                    tz_off = ff_tz_offset or 0
-                    if ff_ok and tz_off > 0:
-                        raw_h = ff_h - tz_off
-                        et_m = ff_m
-                        if raw_h < 0:
-                            raw_h += 24
-                            et_date = cur_date - timedelta(days=1)
-                        et_h = raw_h
-                    elif ff_ok:
-                        et_h, et_m = ff_h, ff_m
-                    else:
-                        et_h, et_m = 10, 0
+def shared_path(kind: str, ym: tuple, ext: str) -> str:
+    return os.path.join(_SHARED_DIR, kind, f"{ym[0]}-{ym[1]:02d}.{ext}")
 
-                if cfg["group"] == "fedchair":
-                    dedup_key = (et_date, "fedchair")
-                    if dedup_key in events_map:
-                        continue
-                else:
-                    dedup_key = (et_date.year, et_date.month, cfg["group"])
-                    if dedup_key in events_map:
-                        if et_date > events_map[dedup_key]["_et_date"]:
-                            del events_map[dedup_key]
-                        else:
-                            continue
 
+def lease_acquire(ym: tuple) -> bool:
+    """O_EXCL 생성으로 lease 획득. 만료된 lease 는 rename (한 runner 만 성공) 으로 회수."""
+    path = shared_path("leases", ym, "lock")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        if time_module.time() - os.path.getmtime(path) > LEASE_SEC:
+            expired = f"{path}.{runner_id()}.expired"
+            os.rename(path, expired)
+            if time_module.time() - os.path.getmtime(expired) > LEASE_SEC:
+                print(f"   🔓 {ym[0]}-{ym[1]:02d}: 만료된 lease 회수")
+            else:
+                # 확인과 rename 사이에 다른 runner 가 새로 잡은 lease — 되돌림
                 try:
-                    naive = datetime.combine(et_date, dt_time(et_h, et_m))
-                    dt_et  = ET.localize(naive)
-                    dt_hkt = dt_et.astimezone(HKT)
-
-                    events_map[dedup_key] = {
-                        "_et_date": et_date,
-                        "name": f"{cfg['emoji']} {cfg['display']}",
-                        "begin_hkt": dt_hkt,
-                        "begin_et":  dt_et,
-                        "tier": cfg["tier"],
-                        "ff_name": event_name,
-                        "desc": (
-                            f"📌 {cfg['display']}\n"
-                            f"📋 FF: {event_name}\n"
-                            f"⏰ ET: {dt_et.strftime('%Y-%m-%d %I:%M %p %Z')}\n"
-                            f"🇭🇰 HKT: {dt_hkt.strftime('%Y-%m-%d %H:%M %Z')}\n"
-                            f"📊 Tier {cfg['tier']}"
-                        ),
-                    }
-                except Exception as e:
-                    print(f"      ❌ {e}")
-
-            time_module.sleep(0.3)
+                    os.link(expired, path)
+                except OSError:
+                    pass
+            os.remove(expired)
+    except OSError:
+        pass
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(runner_id())
+    return True
+
+
+def lease_release(ym: tuple):
+    path = shared_path("leases", ym, "lock")
+    try:
+        with open(path) as f:
+            mine = f.read() == runner_id()
+        if mine:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+def shared_result(ym: tuple):
+    """이번 갱신 주기 결과 → (runner, rows) / 없거나 오래됨 (실패 기록은 SHARED_FAIL_SEC) → None."""
+    try:
+        with open(shared_path("pages", ym, "json"), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    rows = data["rows"]
+    ttl = SHARED_REFRESH_SEC if rows is not None else SHARED_FAIL_SEC
+    if time_module.time() - data["fetched_at"] > ttl:
+        return None
+    if rows is not None:
+        rows = [(date.fromisoformat(r[0]), *r[1:]) for r in rows]
+    return data["runner"], rows
+
+
+def shared_store(ym: tuple, rows):
+    path = shared_path("pages", ym, "json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "fetched_at": time_module.time(),
+        "runner": runner_id(),
+        "rows": None if rows is None else [[r[0].isoformat(), *r[1:]] for r in rows],
+    }
+    write_atomic(path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def shared_pages(fetch, months: list, on_row=None):
+    """
+    달마다: 공유 결과가 새것이면 그대로 사용, 아니면 lease 를 잡은 runner 만 다운로드 → 결과 공유.
+    다른 runner 가 잡은 달은 결과가 나오거나 lease 가 만료될 때까지 기다림 (죽은 runner 의 달 회수).
+    모든 runner 가 같은 결과 집합으로 렌더.
+    """
+    pending = list(months)
+    announced = set()
+    while pending:
+        if time_left() <= 0:
+            skipped = ", ".join(f"{y}-{m:02d}" for y, m in pending)
+            print(f"   ⏭️ 시간 예산 초과 — 취소: {skipped} (이전 데이터 유지)")
+            return
+        waiting = []
+        for ym in pending:
+            result = shared_result(ym)
+            if result is not None:
+                runner, rows = result
+                print(f"   🤝 {ym[0]}-{ym[1]:02d}: 공유 결과 사용 ({runner})")
+                if rows is not None and on_row is not None:
+                    for row in rows:
+                        on_row(ym, row)
+                yield ym, rows
+            elif lease_acquire(ym):
+                try:
+                    rows = fetch(ym, on_row)
+                    shared_store(ym, rows)
+                finally:
+                    lease_release(ym)
+                yield ym, rows
+                pace()
+            else:
+                if ym not in announced:
+                    announced.add(ym)
+                    print(f"   ⏳ {ym[0]}-{ym[1]:02d}: 다른 runner 가 받는 중 — 대기")
+                waiting.append(ym)
+        if waiting:
+            time_module.sleep(max(0.0, min(LEASE_POLL_SEC, time_left())))
+        pending = waiting
+
+
+def calibrate_ff_zone(pages: list, today: date) -> str:
+    """
+    FF 표시 zone. 페이지 파싱 전에 한 번만 — 행 순서와 무관.
+    Known Time 행 (FF 벽시계 → 후보 zone 에서 UTC → 지역 현지 시각) 이 정해진 발표 시각과 가장 많이 맞는
+    후보 (DST 반영) → 없으면 store 에 저장된 이전 값 → 그것도 없으면 ET.
+    """
+    known = []
+    for rows in pages:
+        for ff_date, currency, event_name, tc_text, *_ in rows:
+            if ff_date < today:
+                continue
+            _, cfg, ff_h, ff_m, ff_ok = classify_row((ff_date, currency, event_name, tc_text))
+            if cfg and cfg["time"] is not None and ff_ok:
+                known.append((datetime.combine(ff_date, dt_time(ff_h, ff_m)), currency, dt_time(*cfg["time"])))
+
+    zone, hits = None, 0
+    for name in FF_ZONE_CANDIDATES if known else ():
+        begins = tz_table(name).localize_many(wall for wall, _, _ in known)
+        n = sum(REGION_TZ[cur].convert(b).time() == t for b, (_, cur, t) in zip(begins, known))
+        if n > hits:
+            zone, hits = name, n
+        if n == len(known):
+            break
+
+    if zone is not None:
+        ff_zone_save(zone)
+        print(f"   🕐 FF timezone = {zone} (Known Time {hits}/{len(known)}행 일치)")
+        return zone
+    zone = ff_zone_load()
+    if zone is not None:
+        print(f"   🕐 FF timezone = {zone} (이전 보정값)")
+        return zone
+    print(f"   🕐 FF timezone = {ET_TZ.name} (기본값 — Known Time 행 없음)")
+    return ET_TZ.name
+
+
+def page_candidates(rows: list, stale, ff_zone: str, today: date):
+    """
+    한 페이지 행 → (후보, 스캔 행 수, 본 행 키). ff_zone 은 calibrate_ff_zone 결과 —
+    다른 페이지 / 앞선 행에 의존하지 않으므로 페이지 단위 캐시 / 병렬 처리 가능.
+    """
+    candidates = []
+    scanned = 0
+    seen_keys = set()
+    for ff_date, currency, event_name, tc_text, *values in rows:
+        if ff_date < today:
+            continue
 
-        except Exception as e:
-            print(f"      ❌ {label}: {e}")
+        row_key = (ff_date, currency, event_name, tc_text)
+        seen_keys.add(row_key)
+        counted, cfg, ff_h, ff_m, ff_ok = classify_row(row_key)
+        if not counted:
+            continue
+
+        scanned += 1
+
+        if not cfg:
+            continue
+
+        # (벽시계, zone) — TZ 변환은 호출 측에서 zone 별로 한 번에 (TzTable.localize_many)
+        wall, zone = region_local_time(cfg, currency, ff_date, ff_h, ff_m, ff_ok, ff_zone)
+        candidates.append((
+            wall, cfg, event_name, ff_ok, tuple(values), ff_date, row_key, zone, stale,
+        ))
+    return candidates, scanned, seen_keys
+
+
+def fetch_forex_events(rows_out: list = None, covered_out: set = None) -> list:
+    """
+    다운로드 + 스트리밍 파싱 (워커 프로세스, 행이 완성되는 대로 매칭) → FF 표시 zone 보정 (전 페이지 1회)
+    → 페이지별 지역 현지 날짜 보정 (page_candidates, 페이지 순서 무관) → dedup.
+    covered_out: 이번에 새로 받은 (연, 월) — 나머지 달은 store 의 이전 데이터 유지.
+    받기 / 파싱 실패한 달은 월별 last-good snapshot 으로 대체 (설명에 stale 표시).
+    """
+    print("\n🔍 [1] ForexFactory 경제 지표 수집...")
+    today = datetime.now().date()
+    months = ff_months()
 
-    result = sorted(events_map.values(), key=lambda x: x["begin_hkt"])
-    print(f"   ✅ {scanned}개 USD 스캔 → {len(result)}개 NQ 핵심 이벤트\n")
+    # 행 매칭 (classify_row memo) 은 다운로드 중에 — 아래 루프는 memo 조회만
+    def on_row(ym, row):
+        if row[0] >= today:
+            classify_row(row[:4])
+
+    fresh = {}
+    for ym, rows in fetch_ff_pages(months, on_row):
+        if rows is None:
+            continue
+        fresh[ym] = rows
+        if rows_out is not None:
+            rows_out.extend(rows)
+        if covered_out is not None:
+            covered_out.add(ym)
+
+    # stale-while-revalidate: 실패한 달은 snapshot 사용, 다음 실행에서 다시 받음
+    ff_snapshot_save(fresh)
+    snapshots = ff_snapshot_load([ym for ym in months if ym not in fresh])
+    pages = []
+    for ym in months:
+        if ym in fresh:
+            pages.append((ym, fresh[ym], None))
+        elif ym in snapshots:
+            fetched_at, rows = snapshots[ym]
+            rows = [r for r in rows if page_owns(*ym, r[0])]   # 소유권 규칙 이전 snapshot 호환
+            print(f"      ♻️ {ym[0]}-{ym[1]:02d}: last-good snapshot 사용 ({fetched_at})")
+            pages.append((ym, rows, fetched_at))
+        else:
+            print(f"      ⚠️ {ym[0]}-{ym[1]:02d}: snapshot 없음 — 이번 달 이벤트 누락")
+
+    # 보정 단계: 전 페이지에서 FF 표시 zone 을 한 번에 정한 뒤 페이지별 순수 변환
+    ff_zone = calibrate_ff_zone([rows for _, rows, _ in pages], today)
+    candidates = []
+    scanned = 0
+    seen_keys = set()
+    for ym, rows, stale in pages:
+        page, n, keys = page_candidates(rows, stale, ff_zone, today)
+        if page:
+            print(f"      📅 {ym[0]}-{ym[1]:02d}: {n}개 행 → {len(page)}개 후보")
+        candidates.extend(page)
+        scanned += n
+        seen_keys |= keys
+
+    # 변경 없는 행은 직전 NQEvent 재사용 (이전 실행 것은 store 에서), 나머지만 일괄 TZ 변환
+    if not _EVENT_MEMO:
+        _EVENT_MEMO.update(event_memo_load())
+    keys = [row_hash(c) for c in candidates]
+    events, misses = {}, []
+    for memo_key, c in zip(keys, candidates):
+        evt = _EVENT_MEMO.get(memo_key)
+        if evt is not None and evt.releases == ((c[2], *c[4]),):
+            events[memo_key] = evt
+        else:
+            misses.append((memo_key, c))
+
+    by_zone = {}
+    for m in misses:
+        by_zone.setdefault(m[1][7], []).append(m)
+    for zone, zone_misses in by_zone.items():
+        begins = tz_table(zone).localize_many(c[0] for _, c in zone_misses)
+        if zone != ET_TZ.name:
+            begins = ET_TZ.convert_many(begins)
+        for begin, (memo_key, (_, cfg, event_name, ff_ok, values, ff_date, row_key, _, stale)) in zip(begins, zone_misses):
+            events[memo_key] = NQEvent(
+                "ff", cfg["group"], cfg["display"], cfg["emoji"], cfg["tier"], begin,
+                ff_name=event_name,
+                timed=ff_ok or cfg["time"] is not None,
+                releases=((event_name, *values),),
+                ff_date=ff_date,
+                currency=row_key[1],
+                stale_since=stale,
+            )
+
+    # memo 는 이번 페이지에 있는 행만 유지 (크기 = 페이지 행 수)
+    for k in [k for k in _ROW_MEMO if k not in seen_keys]:
+        del _ROW_MEMO[k]
+    if misses or events.keys() != _EVENT_MEMO.keys():
+        event_memo_save(events)
+    _EVENT_MEMO.clear()
+    _EVENT_MEMO.update(events)
+    if candidates:
+        print(f"   ♻️ 행 memo: {len(candidates) - len(misses)}/{len(candidates)} 재사용")
+
+    result = merge_events([events[k] for k in keys])
+    print(f"   ✅ {scanned}개 행 스캔 ({', '.join(EVENTS_DEF)}) → {len(result)}개 NQ 핵심 이벤트\n")
     return result
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 2. BIG TECH EARNINGS (날짜 수정)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_YF_SESSION = None
+_YF_TICKERS = {}
+
+
+def yf_session():
+    """
+    모든 yf.Ticker 가 공유하는 curl_cffi 세션 (yfinance 가 받는 세션 타입).
+    keep-alive 연결은 스레드별 curl 핸들 → YF_WORKERS 스레드 = 연결 풀 크기.
+    crumb / cookie 는 yfinance 가 세션에 묶어 재사용하고, 쿠키 캐시는 YF_CACHE_DIR 에 유지.
+    """
+    global _YF_SESSION
+    if _YF_SESSION is None:
+        import yfinance as yf
+
+        try:
+            from curl_cffi import requests as curl_requests
+        except ImportError:
+            return None
+        os.makedirs(YF_CACHE_DIR, exist_ok=True)
+        yf.set_tz_cache_location(YF_CACHE_DIR)
+        _YF_SESSION = curl_requests.Session(impersonate="chrome")
+    return _YF_SESSION
+
+
+def yf_ticker(sym: str):
+    """Ticker 객체도 실행 동안 재사용 (fast_info / calendar 내부 캐시 공유)."""
+    import yfinance as yf
+
+    if sym not in _YF_TICKERS:
+        _YF_TICKERS[sym] = yf.Ticker(sym, session=yf_session())
+    return _YF_TICKERS[sym]
+
+
+def yf_cached(kind: str, sym: str, fetch):
+    """
+    store 의 yf_cache (종류별 만료 YF_CACHE_TTL) → 없거나 만료면 fetch() 후 저장.
+    yfinance 는 캐싱 세션 (requests_cache 등) 을 거부 → HTTP 응답 대신 추출한 값을 캐시.
+    """
+    hit = yf_cache_load(kind, sym)
+    if hit is not None:
+        return hit
+    value = fetch()
+    if value is not None:
+        yf_cache_save(kind, sym, value, YF_CACHE_TTL[kind])
+    return value
+
+
+def yf_map(fn, syms: list, what: str) -> list:
+    """
+    티커별 조회를 YF_WORKERS daemon 스레드로 (순서 유지). 시간 예산 초과 → TimeoutError.
+    yfinance 요청 timeout (30s) 은 바꿀 수 없어서 멈춘 조회는 기다리지 않고 버림.
+    """
+    results = [None] * len(syms)
+    todo = iter(enumerate(syms))
+    lock = threading.Lock()
+
+    def worker():
+        while time_left() > 0:
+            with lock:
+                item = next(todo, None)
+            if item is None:
+                return
+            i, sym = item
+            try:
+                results[i] = (True, fn(sym))
+            except Exception as e:
+                results[i] = (False, e)
+
+    threads = [threading.Thread(target=worker, name=f"yf-{i}", daemon=True)
+               for i in range(min(YF_WORKERS, len(syms)))]
+    for t in threads:
+        t.start()
+    if not join_by_deadline(threads) or None in results:
+        raise TimeoutError(f"시간 예산 초과 ({what})")
+    for ok, value in results:
+        if not ok:
+            raise value
+    return [value for _, value in results]
+
+
+def market_cap(sym: str):
+    try:
+        return yf_ticker(sym).fast_info.get('marketCap', 0) or None
+    except Exception:
+        return None
+
+
 def get_top_tickers(n=EARNINGS_TOP_N) -> list:
     print(f"🔍 [2] 시가총액 Top {n}...")
-    data = []
-    for sym in EARNINGS_CANDIDATES:
-        try:
-            cap = yf.Ticker(sym).fast_info.get('marketCap', 0)
-            if cap:
-                data.append((sym, cap))
-        except Exception:
-            pass
+    caps = yf_map(lambda sym: yf_cached("market_cap", sym, lambda: market_cap(sym)),
+                  EARNINGS_CANDIDATES, "시가총액")
+    data = [(sym, cap) for sym, cap in zip(EARNINGS_CANDIDATES, caps) if cap]
     data.sort(key=lambda x: x[1], reverse=True)
     top = [t[0] for t in data[:n]]
     print(f"   ✅ {top}")
     return top
 
 
+def earnings_date(sym: str):
+    """yfinance 실적일 → ET 달력 날짜 (없으면 None)."""
+    import pandas as pd
+
+    stock = yf_ticker(sym)
+    earn_date = None
+
+    try:
+        cal = stock.calendar
+        if isinstance(cal, dict) and 'Earnings Date' in cal:
+            dates = cal['Earnings Date']
+            if dates:
+                earn_date = dates[0]
+        elif hasattr(cal, 'iloc') and not cal.empty:
+            for v in cal.values.flatten():
+                if isinstance(v, (datetime, pd.Timestamp, date)):
+                    earn_date = v
+                    break
+    except Exception:
+        pass
+
+    if earn_date is None:
+        try:
+            eds = stock.get_earnings_dates(limit=4)
+            if eds is not None and not eds.empty:
+                future = eds.index[eds.index > datetime.now(pytz.utc)]
+                if not future.empty:
+                    earn_date = future[0]
+        except Exception:
+            pass
+
+    if earn_date is None:
+        return None
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 날짜 추출 (수정됨)
+    # yfinance 실적일 = 달력 날짜.
+    # 자정 데이터를 UTC→ET 변환하면 -1일 버그 발생.
+    # → 자정이면 timezone 변환 없이 날짜만 추출.
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    if isinstance(earn_date, pd.Timestamp):
+        earn_date = earn_date.to_pydatetime()
+
+    if isinstance(earn_date, date) and not isinstance(earn_date, datetime):
+        # date 객체 → 그대로 사용
+        d = earn_date
+    elif earn_date.hour == 0 and earn_date.minute == 0:
+        # 자정 = 달력 날짜 placeholder → 날짜만 추출
+        d = earn_date.date()
+    else:
+        # 구체적 시간 있음 → ET 변환 후 날짜 추출
+        if earn_date.tzinfo is None:
+            earn_date = pytz.utc.localize(earn_date)
+        d = ET_TZ.convert(earn_date).date()
+    return d
+
+
 def fetch_earnings(tickers: list) -> list:
     print(f"\n🔍 [3] 실적 발표일 수집... {tickers}")
     results = []
 
-    for sym in tickers:
+    def lookup(sym):
+        def fetch():
+            d = earnings_date(sym)
+            return d.isoformat() if d else None
+
         try:
-            stock = yf.Ticker(sym)
-            earn_date = None
+            return sym, yf_cached("earnings_date", sym, fetch), None
+        except Exception as e:
+            return sym, None, e
 
+    # 일부만 받은 결과로 store 를 덮지 않음 → 시간 예산 초과는 소스 실패 처리 (이전 실적일 유지)
+    for sym, d, err in yf_map(lookup, tickers, "실적"):
+        if err is not None:
+            print(f"   ❌ {sym}: {err}")
+            continue
+        if d is None:
+            print(f"   ⚠️ {sym}: 발표일 없음")
+            continue
+        d = date.fromisoformat(d)
+        if not is_trading_day(d):
+            # 휴장일 placeholder → 다음 개장일 장 시작
+            shifted = trading_day_on_or_after(d)
+            print(f"   📅 {sym}: {d} 휴장 → {shifted}")
+            d = shifted
+        results.append(NQEvent(
+            "earnings", f"earnings_{sym.lower()}", f"{sym} Earnings", "💰", 1,
+            ET_TZ.localize(datetime.combine(d, dt_time(9, 30))),
+            pre_alarm=False,
+        ))
+        print(f"   ✅ {sym}: {d}")
+
+    return results
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 3. ICS 생성 (Earnings 알람 수정)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+DEFAULT_ALARMS = (30, MARKET_PREP_ET.strftime("%H:%M"))     # 기본 캘린더 알람 (30분 전, 장준비 ET)
+
+
+def generate_ics(events: list):
+    """HKT 기본 캘린더 — 캐시된 VEVENT fragment 이어붙이기 (바뀐 이벤트만 직렬화)."""
+    frags = render_fragments(events, HKT_TZ.name, DEFAULT_ALARMS)
+    body = ICS_HEADER + b"".join(frags) + ICS_FOOTER
+    publish_files({OUTPUT_FILE: body})
+
+    print(f"\n🚀 '{OUTPUT_FILE}' 생성 완료 ({len(events)}개)")
+
+
+ICS_HEADER = b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//nq-trading-calendar//EN\r\n"
+ICS_FOOTER = b"END:VCALENDAR\r\n"
+
+
+def ics_text(value: str) -> str:
+    """RFC 5545 TEXT 이스케이프."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+                 .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def ics_line(line: str) -> bytes:
+    """한 content line → 75 octet 단위 folding (UTF-8 문자 중간에서 자르지 않음)."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return raw + b"\r\n"
+    out, limit = [], 75
+    while len(raw) > limit:
+        cut = limit
+        while cut > 0 and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        out.append(raw[:cut])
+        raw, limit = raw[cut:], 74    # 이어지는 줄은 앞 공백 1바이트
+    out.append(raw)
+    return b"\r\n ".join(out) + b"\r\n"
+
+
+def ics_duration(td: timedelta) -> str:
+    sign, secs = ("-", -td) if td < timedelta(0) else ("", td)
+    days, rem = secs.days, secs.seconds
+    h, m, s = rem // 3600, rem % 3600 // 60, rem % 60
+    out = f"{sign}P" + (f"{days}D" if days else "")
+    if h or m or s or not days:
+        out += "T" + (f"{h}H" if h else "") + (f"{m}M" if m else "") + (f"{s}S" if s or not (h or m) else "")
+    return out
+
+
+def vevent_alarms(evt: "NQEvent", pre_alarm_min: int = 30, prep_offset: timedelta = None) -> bytes:
+    """VEVENT 시작 + 알람 (알람 정책에만 의존). 뒤에 vevent_body 를 이어붙이면 VEVENT 하나."""
+    alarms = []
+    if evt.pre_alarm and pre_alarm_min:
+        alarms.append(timedelta(minutes=-pre_alarm_min))
+    if prep_offset is not None and prep_offset < timedelta(0):
+        alarms.append(prep_offset)
+    lines = ["BEGIN:VEVENT"]
+    for trigger in alarms:
+        lines += ["BEGIN:VALARM", "ACTION:DISPLAY", "DESCRIPTION:",
+                  f"TRIGGER:{ics_duration(trigger)}", "END:VALARM"]
+    return b"".join(ics_line(l) for l in lines)
+
+
+def vevent_body(evt: "NQEvent", desc: str) -> bytes:
+    """VEVENT 나머지 속성 (시간대에만 의존 — 설명의 현지 시각)."""
+    lines = [
+        f"DESCRIPTION:{ics_text(desc)}",
+        "DURATION:PT30M",
+        f"DTSTART:{evt.begin_et.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}",
+        f"SUMMARY:{ics_text(evt.name)}",
+        f"UID:{evt.uid}@nq-trading-calendar",
+        "END:VEVENT",
+    ]
+    return b"".join(ics_line(l) for l in lines)
+
+
+def prep_offsets(events: list, prep) -> list:
+    """장준비 알람 ("HH:MM" ET) → 이벤트 시작 기준 offset. NYSE 개장일만 (휴장 / 주말 제외 — 세션 색인 O(1) 조회)."""
+    if not prep:
+        return [None] * len(events)
+    t = dt_time.fromisoformat(prep)
+    preps = ET_TZ.localize_many(datetime.combine(e.et_date, t) for e in events)
+    return [p - e.begin_et if is_trading_day(e.et_date) else None for p, e in zip(preps, events)]
+
+
+# VEVENT fragment 캐시 — (uid, 프로필) → (이벤트 버전, bytes). 프로세스 memo + store (vevent_cache)
+FRAGMENT_FORMAT = 3     # 직렬화 / 설명 형식이 바뀌면 올림 (캐시 무효화)
+_FRAGMENT_MEMO = {}
+
+
+def tz_label(tz_name: str) -> str:
+    if tz_name == HKT_TZ.name:
+        return "🇭🇰 HKT"
+    return f"🕐 {tz_name.rsplit('/', 1)[-1].replace('_', ' ')}"
+
+
+def event_version(evt: "NQEvent") -> str:
+    import hashlib
+
+    raw = json.dumps([FRAGMENT_FORMAT, evt.to_json()], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def profile_key(tz_name: str, alarms: tuple) -> str:
+    pre_min, prep = alarms
+    return f"{tz_name}|{pre_min}|{prep or '-'}"
+
+
+def fragment_memo(profile: str) -> dict:
+    """프로필의 {uid: (버전, bytes)} — 프로세스 memo, 비어 있으면 store 에서."""
+    memo = _FRAGMENT_MEMO.setdefault(profile, {})
+    if not memo and os.path.exists(DB_FILE):
+        conn = db_connect()
+        memo.update({
+            uid: (ver, frag) for uid, ver, frag in conn.execute(
+                "SELECT uid, version, fragment FROM vevent_cache WHERE profile = ?", (profile,)
+            )
+        })
+        conn.close()
+    return memo
+
+
+def render_fragments(events: list, tz_name: str, alarms: tuple, verbose: bool = True) -> list:
+    """
+    events → VEVENT bytes 리스트 (같은 순서).
+    alarms = (30분 전 알람 분, 장준비 알람 "HH:MM" ET 또는 None).
+    """
+    return render_tz(events, tz_name, {alarms}, verbose)[alarms]
+
+
+def render_tz(events: list, tz_name: str, alarm_set: set, verbose: bool = True) -> dict:
+    """
+    한 시간대의 {알람 정책: [VEVENT bytes, ...]} (events 순서).
+    (uid, 버전, 시간대 / 알람 프로필) 이 같으면 캐시 재사용 — 바뀐 이벤트만 다시 만듦.
+    현지 시각 / 설명 / 본문은 시간대당 한 번, 알람 줄만 알람 정책별.
+    """
+    versions = [event_version(e) for e in events]
+    memos = {alarms: fragment_memo(profile_key(tz_name, alarms)) for alarms in alarm_set}
+    todos = {
+        alarms: [i for i, (e, v) in enumerate(zip(events, versions)) if memo.get(e.uid, (None,))[0] != v]
+        for alarms, memo in memos.items()
+    }
+
+    # 어느 프로필에서든 다시 만들 이벤트 → 설명 + 본문 한 번씩
+    need = sorted(set().union(*todos.values()))
+    bodies = {}
+    if need:
+        miss = [events[i] for i in need]
+        if tz_name == HKT_TZ.name:
+            descs = [e.desc for e in miss]       # 기본 설명 (NQEvent 에 캐시)
+        else:
+            label = tz_label(tz_name)
+            locals_ = tz_table(tz_name).convert_many(e.begin_et for e in miss)
+            descs = [format_desc(e, loc, label) for e, loc in zip(miss, locals_)]
+        bodies = {i: vevent_body(e, d) for i, e, d in zip(need, miss, descs)}
+
+    # 이번 이벤트 집합에 없는 uid 는 버림 (memo / store 크기 = 이벤트 수)
+    live = {e.uid for e in events}
+    out, upserts, deletes = {}, [], []
+    for alarms, memo in memos.items():
+        pre_min, prep = alarms
+        profile = profile_key(tz_name, alarms)
+        todo = todos[alarms]
+        miss = [events[i] for i in todo]
+        for i, e, off in zip(todo, miss, prep_offsets(miss, prep)):
+            memo[e.uid] = (versions[i], vevent_alarms(e, pre_min, off) + bodies[i])
+            upserts.append((e.uid, profile, versions[i], memo[e.uid][1]))
+        dropped = [uid for uid in memo if uid not in live]
+        for uid in dropped:
+            del memo[uid]
+        deletes += [(uid, profile) for uid in dropped]
+        if verbose:
+            print(f"   🧩 VEVENT [{profile}]: {len(events) - len(todo)}/{len(events)} 캐시 재사용")
+        out[alarms] = [memo[e.uid][1] for e in events]
+
+    if upserts or deletes:
+        conn = db_connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO vevent_cache VALUES (?, ?, ?, ?)", upserts)
+            conn.executemany("DELETE FROM vevent_cache WHERE uid = ? AND profile = ?", deletes)
+        conn.close()
+    return out
+
+
+def vevent_cache_prune(keep: set):
+    """쓰는 프로필 (profile_key) 외의 fragment 캐시 정리 — 구독자가 떠난 (시간대, 알람) 조합."""
+    for profile in [p for p in _FRAGMENT_MEMO if p not in keep]:
+        del _FRAGMENT_MEMO[profile]
+    if not os.path.exists(DB_FILE):
+        return
+    conn = db_connect()
+    with conn:
+        stale = [p for (p,) in conn.execute("SELECT DISTINCT profile FROM vevent_cache") if p not in keep]
+        conn.executemany("DELETE FROM vevent_cache WHERE profile = ?", [(p,) for p in stale])
+    conn.close()
+    if stale:
+        print(f"   🧹 VEVENT 캐시: 안 쓰는 프로필 {len(stale)}개 정리")
+
+
+def write_atomic(path: str, data: bytes, sync: bool = True):
+    """임시 파일 → fsync → rename. 읽는 쪽은 이전 파일 아니면 완성된 새 파일만 봄."""
+    import tempfile
+
+    folder = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix="." + os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    if sync and hasattr(os, "O_DIRECTORY"):
+        # rename 자체도 디스크에 (POSIX)
+        dfd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+
+
+def encoded_variants(body: bytes) -> dict:
+    """{접미사: bytes} — 원본 / .gz / .br (brotli 설치 시). 정적 호스트가 그대로 서빙."""
+    import gzip
+
+    variants = {"": body, ".gz": gzip.compress(body, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+        variants[".br"] = brotli.compress(body, quality=11)
+    except ImportError:
+        print("   ⚠️ brotli 미설치 — .br 생략 (pip install -r requirements.txt)")
+    return variants
+
+
+def publish_files(files: dict):
+    """
+    {파일명: bytes} → PUBLISH_DIRS 각각에 (병렬) 원본 + 압축본 + manifest 를 원자적으로 씀.
+    manifest 는 마지막에 — manifest 에 있는 파일은 항상 존재.
+    """
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    out = {}
+    for name, body in files.items():
+        for suffix, data in encoded_variants(body).items():
+            out[name + suffix] = data
+    manifest = json.dumps({
+        "generated_at": utc_now_iso(),
+        "files": {
+            name: {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+            for name, data in out.items()
+        },
+    }, indent=2).encode()
+
+    def to_dir(folder):
+        os.makedirs(folder, exist_ok=True)
+        for name, data in out.items():
+            write_atomic(os.path.join(folder, name), data)
+        write_atomic(os.path.join(folder, MANIFEST_FILE), manifest)
+
+    with ThreadPoolExecutor(max_workers=len(PUBLISH_DIRS)) as pool:
+        futures = {d: pool.submit(to_dir, d) for d in PUBLISH_DIRS}
+        for folder, fut in futures.items():
             try:
-                cal = stock.calendar
-                if isinstance(cal, dict) and 'Earnings Date' in cal:
-                    dates = cal['Earnings Date']
-                    if dates:
-                        earn_date = dates[0]
-                elif hasattr(cal, 'iloc') and not cal.empty:
-                    for v in cal.values.flatten():
-                        if isinstance(v, (datetime, pd.Timestamp, date)):
-                            earn_date = v
-                            break
-            except Exception:
-                pass
+                fut.result()
+            except OSError as e:
+                print(f"   ❌ publish[{folder}]: {e}")
+
+
+def publish(events: list):
+    """ICS 생성 + change feed / freshness 기록."""
+    generate_ics(events)
+    record_changes(events, render_start())
+    record_freshness(events)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 4. RELEASE-DAY 폴링 (발표 직후 actual 반영)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def ff_day_url(d: date) -> str:
+    return f"https://www.forexfactory.com/calendar?day={d.strftime('%b%d.%Y').lower()}"
+
+
+def fetch_if_changed(scraper, url: str, validators: dict):
+    """조건부 GET. 변경 없으면 (304) None."""
+    headers = {}
+    v = validators.get(url, {})
+    if v.get("etag"):
+        headers["If-None-Match"] = v["etag"]
+    if v.get("last_modified"):
+        headers["If-Modified-Since"] = v["last_modified"]
+
+    resp = scraper.get(url, headers=headers, timeout=10)
+    if resp.status_code == 304:
+        return None
+    if resp.status_code != 200:
+        print(f"      ⚠️ HTTP {resp.status_code}")
+        return None
+
+    validators[url] = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+    return resp.content
+
+
+def scan_release_rows(html, day: date) -> dict:
+    """Day 페이지 → {group: [(ff_name, actual, forecast, previous), ...]}"""
+    found = {}
+    for ff_date, currency, event_name, tc_text, *values in parse_page_rows(html, day.year, day.month) or []:
+        _, cfg, *_ = classify_row((ff_date, currency, event_name, tc_text))
+        if cfg:
+            found.setdefault(cfg["group"], []).append((event_name, *values))
+    return found
+
+
+def release_day():
+    import cloudscraper
+
+    print("\n⚡ Release-day 모드")
+    set_deadline(RUN_BUDGET_SEC)
+    coverage = {}
+    for name, events in collect_sources(coverage=coverage).items():
+        store_save(name, events, coverage.get(name))
+    set_deadline(None)
+    all_events = store_query(render_start())
+    publish(all_events)
+
+    # 수치 발표가 있는 지표만 (forecast/previous 칸이 있는 행) — 연설/기자회견 제외
+    now_et = datetime.now(ET)
+    targets = [
+        e for e in all_events
+        if e.source == "ff"
+        and e.timed
+        and e.begin_et.date() == now_et.date()
+        and e.begin_et + timedelta(minutes=RELEASE_TIMEOUT_MIN) > now_et
+        and any(r[2] or r[3] for r in e.releases)
+    ]
+    if not targets:
+        print("   💤 오늘 남은 발표 없음")
+        return
+
+    slots = {}
+    for evt in targets:
+        slots.setdefault((evt.begin_et, evt.ff_date), []).append(evt)
+
+    scraper = cloudscraper.create_scraper()
+    validators = {}
+
+    for (begin_et, ff_date), evts in sorted(slots.items()):
+        names = ", ".join(e.display for e in evts)
+        start    = begin_et - timedelta(minutes=RELEASE_LEAD_MIN)
+        deadline = begin_et + timedelta(minutes=RELEASE_TIMEOUT_MIN)
+        url = ff_day_url(ff_date)
+
+        wait = (start - datetime.now(ET)).total_seconds()
+        if wait > 0:
+            print(f"   ⏳ {begin_et.strftime('%I:%M %p ET')} {names} — {wait / 60:.0f}분 대기")
+            time_module.sleep(wait)
+
+        print(f"   📡 폴링 시작: {names} ({url})")
+        pending = {e.group: e for e in evts}
+
+        while pending:
+            if datetime.now(ET) >= deadline:
+                print(f"   ⏱️ 타임아웃 — 미발표: {', '.join(pending)}")
+                break
+
+            try:
+                html = fetch_if_changed(scraper, url, validators)
+            except Exception as e:
+                print(f"      ❌ {e}")
+                html = None
+
+            if html:
+                found = scan_release_rows(html, ff_date)
+                released = []
+                for group, evt in list(pending.items()):
+                    rows = found.get(group)
+                    if rows and all(r[1] for r in rows):
+                        evt.set_releases(rows)
+                        released.append(evt)
+                        del pending[group]
+
+                if released:
+                    store_save("ff", released, prune=False)
+                    publish(all_events)
+                    lag = (datetime.now(ET) - begin_et).total_seconds()
+                    for evt in released:
+                        vals = ", ".join(f"{r[0]} {r[1]}" for r in evt.releases)
+                        print(f"   ✅ {evt.display}: {vals} (발표 +{lag:.0f}s)")
+
+            if pending:
+                time_module.sleep(RELEASE_POLL_SEC)
 
-            if earn_date is None:
-                try:
-                    eds = stock.get_earnings_dates(limit=4)
-                    if eds is not None and not eds.empty:
-                        future = eds.index[eds.index > datetime.now(pytz.utc)]
-                        if not future.empty:
-                            earn_date = future[0]
-                except Exception:
-                    pass
 
-            if earn_date is None:
-                print(f"   ⚠️ {sym}: 발표일 없음")
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 5. EVENT STORE (SQLite) — FF 원본 행 / 이벤트 / 변경 이력
+# 인덱스는 dedup 키와 동일: (et_date, grp), (year, month, grp)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 소스마다 같은 uid (그룹:날짜) 가 따로 저장됨 — 소스 간 merge 는 조회 시 (merge_sources)
+EVENTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    uid        TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    grp        TEXT NOT NULL,
+    tier       INTEGER NOT NULL,
+    et_date    TEXT NOT NULL,
+    year       INTEGER NOT NULL,
+    month      INTEGER NOT NULL,
+    begin_utc  INTEGER NOT NULL,
+    data       TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source, uid)
+);
+CREATE INDEX IF NOT EXISTS idx_events_date_grp  ON events (et_date, grp);
+CREATE INDEX IF NOT EXISTS idx_events_month_grp ON events (year, month, grp);
+CREATE INDEX IF NOT EXISTS idx_events_begin     ON events (begin_utc);
+CREATE INDEX IF NOT EXISTS idx_events_uid       ON events (uid);
+"""
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ff_rows (
+    ff_date   TEXT NOT NULL,
+    currency  TEXT NOT NULL,
+    ff_name   TEXT NOT NULL,
+    time_text TEXT,
+    actual    TEXT,
+    forecast  TEXT,
+    previous  TEXT,
+    seen_at   TEXT NOT NULL,
+    PRIMARY KEY (ff_date, currency, ff_name)
+);
+CREATE TABLE IF NOT EXISTS ff_snapshots (
+    year       INTEGER NOT NULL,
+    month      INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    rows       TEXT NOT NULL,
+    PRIMARY KEY (year, month)
+);
+CREATE TABLE IF NOT EXISTS ff_zone (
+    id            INTEGER PRIMARY KEY CHECK (id = 1),
+    zone          TEXT NOT NULL,
+    calibrated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ff_event_memo (
+    row_hash TEXT PRIMARY KEY,
+    data     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS yf_cache (
+    kind       TEXT NOT NULL,
+    symbol     TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (kind, symbol)
+);
+""" + EVENTS_SCHEMA + """
+CREATE TABLE IF NOT EXISTS event_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    uid TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS revisions (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    uid        TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    old_begin  TEXT,
+    new_begin  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_revisions_uid ON revisions (uid);
+CREATE TABLE IF NOT EXISTS published (
+    uid       TEXT PRIMARY KEY,
+    name      TEXT NOT NULL,
+    begin     TEXT NOT NULL,
+    desc_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    at      TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS freshness (
+    uid          TEXT PRIMARY KEY,
+    grp          TEXT NOT NULL,
+    first_seen   TEXT NOT NULL,
+    last_changed TEXT NOT NULL,
+    change_kind  TEXT NOT NULL,
+    published_at TEXT
+);
+CREATE TABLE IF NOT EXISTS freshness_log (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    uid          TEXT NOT NULL,
+    grp          TEXT NOT NULL,
+    kind         TEXT NOT NULL,
+    detected_at  TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    latency_s    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_freshness_log_pub ON freshness_log (published_at);
+CREATE TABLE IF NOT EXISTS vevent_cache (
+    uid      TEXT NOT NULL,
+    profile  TEXT NOT NULL,
+    version  TEXT NOT NULL,
+    fragment BLOB NOT NULL,
+    PRIMARY KEY (uid, profile)
+);
+"""
+
+
+def db_connect():
+    import sqlite3
+
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(STORE_SCHEMA)
+    store_migrate(conn)
+    return conn
+
+
+def store_migrate(conn):
+    """
+    이전 events 테이블 (uid 단독 PK — 다른 소스가 같은 uid 를 덮어씀) → (source, uid) PK 로 옮김.
+    통화별 고정 offset 보정값 (ff_calibration, DST 미반영) 은 ff_zone 으로 대체 — 삭제.
+    """
+    def pk():
+        return [r[1] for r in sorted(conn.execute("PRAGMA table_info(events)"), key=lambda r: r[5]) if r[5]]
+
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'ff_calibration'").fetchone():
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS ff_calibration")
+    if pk() != ["uid"]:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if pk() == ["uid"]:      # 다른 프로세스가 먼저 옮겼을 수 있음
+            conn.execute("ALTER TABLE events RENAME TO events_v1")
+            for name in ("idx_events_date_grp", "idx_events_month_grp", "idx_events_begin"):
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+            for stmt in EVENTS_SCHEMA.split(";"):
+                if stmt.strip():
+                    conn.execute(stmt)
+            conn.execute("INSERT INTO events SELECT * FROM events_v1")
+            conn.execute("DROP TABLE events_v1")
+            print("   🔧 store: events 키 (uid) → (source, uid)")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def store_ff_rows(rows: list):
+    """파싱된 FF 행 전체 (모든 통화) upsert."""
+    now = utc_now_iso()
+    conn = db_connect()
+    with conn:
+        conn.executemany(
+            """INSERT INTO ff_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (ff_date, currency, ff_name) DO UPDATE SET
+                   time_text = excluded.time_text, actual = excluded.actual,
+                   forecast = excluded.forecast, previous = excluded.previous,
+                   seen_at = excluded.seen_at""",
+            [(r[0].isoformat(), *r[1:7], now) for r in rows],
+        )
+    conn.close()
+
+
+def ff_snapshot_save(pages: dict):
+    """정상 파싱된 월 페이지 행 → 월별 last-good snapshot (달 단위 통째로 교체)."""
+    if not pages:
+        return
+    now = utc_now_iso()
+    conn = db_connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO ff_snapshots VALUES (?, ?, ?, ?)",
+            [
+                (y, m, now, json.dumps([[r[0].isoformat(), *r[1:]] for r in rows], ensure_ascii=False))
+                for (y, m), rows in pages.items()
+            ],
+        )
+    conn.close()
+
+
+def ff_snapshot_load(months: list) -> dict:
+    """{(연, 월): (fetched_at, rows)} — snapshot 있는 달만."""
+    if not months or not os.path.exists(DB_FILE):
+        return {}
+    conn = db_connect()
+    found = {}
+    for y, m in months:
+        row = conn.execute(
+            "SELECT fetched_at, rows FROM ff_snapshots WHERE year = ? AND month = ?", (y, m)
+        ).fetchone()
+        if row:
+            found[(y, m)] = (row[0], [
+                (date.fromisoformat(r[0]), *r[1:]) for r in json.loads(row[1])
+            ])
+    conn.close()
+    return found
+
+
+def ff_zone_save(zone: str):
+    """감지된 FF 표시 zone → store (다음 실행에서 Known Time 행이 없을 때의 보정값)."""
+    conn = db_connect()
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO ff_zone VALUES (1, ?, ?)", (zone, utc_now_iso()))
+    conn.close()
+
+
+def ff_zone_load():
+    if not os.path.exists(DB_FILE):
+        return None
+    conn = db_connect()
+    row = conn.execute("SELECT zone FROM ff_zone").fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def event_memo_save(events: dict):
+    """{row_hash: NQEvent} → store (통째로 교체 — 이번 페이지들에 있는 행만)."""
+    conn = db_connect()
+    with conn:
+        conn.execute("DELETE FROM ff_event_memo")
+        conn.executemany(
+            "INSERT INTO ff_event_memo VALUES (?, ?)",
+            [(h, json.dumps(evt.to_json(), ensure_ascii=False)) for h, evt in events.items()],
+        )
+    conn.close()
+
+
+def event_memo_load() -> dict:
+    if not os.path.exists(DB_FILE):
+        return {}
+    conn = db_connect()
+    found = {h: NQEvent.from_json(json.loads(data))
+             for h, data in conn.execute("SELECT row_hash, data FROM ff_event_memo")}
+    conn.close()
+    return found
+
+
+def yf_cache_load(kind: str, sym: str):
+    if not os.path.exists(DB_FILE):
+        return None
+    conn = db_connect()
+    row = conn.execute(
+        "SELECT value FROM yf_cache WHERE kind = ? AND symbol = ? AND expires_at > ?",
+        (kind, sym, time_module.time()),
+    ).fetchone()
+    conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def yf_cache_save(kind: str, sym: str, value, ttl: float):
+    conn = db_connect()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO yf_cache VALUES (?, ?, ?, ?)",
+            (kind, sym, json.dumps(value), time_module.time() + ttl),
+        )
+    conn.close()
+
+
+def store_save(source: str, events: list, covered: set = None, prune: bool = True):
+    """
+    소스 결과 upsert ((source, uid) 키 — 다른 소스의 같은 uid 는 건드리지 않음). 시각이 바뀌면 revisions 에 기록.
+    새 이벤트 / 내용 변경은 freshness 에 감지 시각 기록 (배포까지 지연 측정용).
+    이 소스의 미래 이벤트 중 이번 결과에 없는 것은 삭제 (이력은 남김, freshness 행은 같이 삭제).
+    covered: 새로 받은 FF 페이지 (연, 월) — 그 밖의 달 이벤트는 삭제하지 않음 (이전 데이터 유지).
+    prune=False: 일부만 갱신 (release-day 수치) — 삭제 없음.
+    """
+    now = utc_now_iso()
+    now_ts = int(time_module.time())
+    conn = db_connect()
+    with conn:
+        old = {uid: (begin, data) for uid, begin, data in conn.execute(
+            "SELECT uid, json_extract(data, '$.begin_et'), data FROM events WHERE source = ?",
+            (source,),
+        )}
+        revs, fresh = [], []
+        for e in events:
+            begin = e.begin_et.isoformat()
+            data = json.dumps(e.to_json(), ensure_ascii=False)
+            if e.uid not in old:
+                fresh.append((e.uid, e.group, now, now, "added"))
+            elif old[e.uid][0] != begin:
+                revs.append((e.uid, now, old[e.uid][0], begin))
+                fresh.append((e.uid, e.group, now, now, "rescheduled"))
+            elif old[e.uid][1] != data:
+                fresh.append((e.uid, e.group, now, now, "updated"))
+            conn.execute(
+                """INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (source, uid) DO UPDATE SET
+                       grp = excluded.grp, tier = excluded.tier,
+                       et_date = excluded.et_date, year = excluded.year,
+                       month = excluded.month, begin_utc = excluded.begin_utc,
+                       data = excluded.data,
+                       updated_at = CASE WHEN events.data = excluded.data
+                                         THEN events.updated_at ELSE excluded.updated_at END""",
+                (e.uid, source, e.group, e.tier, e.et_date.isoformat(),
+                 e.et_date.year, e.et_date.month, int(e.begin_et.timestamp()),
+                 data, now),
+            )
+        conn.executemany(
+            """INSERT INTO freshness VALUES (?, ?, ?, ?, ?, NULL)
+               ON CONFLICT (uid) DO UPDATE SET
+                   last_changed = excluded.last_changed,
+                   change_kind = excluded.change_kind, published_at = NULL""",
+            fresh,
+        )
+
+        keep = {e.uid for e in events}
+        stale = 0
+        gone = []
+        for uid, ff_date in conn.execute(
+            "SELECT uid, json_extract(data, '$.ff_date') FROM events"
+            " WHERE source = ? AND begin_utc >= ?",
+            (source, now_ts),
+        ) if prune else ():
+            if uid in keep:
+                continue
+            if covered is not None and (not ff_date or tuple(map(int, ff_date.split("-")[:2])) not in covered):
+                stale += 1
+            else:
+                gone.append(uid)
+        for uid in gone:
+            revs.append((uid, now, old.get(uid, (None,))[0], None))
+            conn.execute("DELETE FROM events WHERE source = ? AND uid = ?", (source, uid))
+            # 사라진 이벤트는 배포될 일이 없음 → 미배포 freshness 가 쌓이지 않게 같이 삭제 (다른 소스에 남아 있으면 유지)
+            conn.execute(
+                "DELETE FROM freshness WHERE uid = ?"
+                " AND NOT EXISTS (SELECT 1 FROM events WHERE events.uid = freshness.uid)",
+                (uid,),
+            )
+        # 이전 버전이 남긴 고아 행 정리 (미배포 행만 — 수는 적음)
+        conn.execute(
+            "DELETE FROM freshness WHERE published_at IS NULL"
+            " AND NOT EXISTS (SELECT 1 FROM events WHERE events.uid = freshness.uid)"
+        )
+
+        conn.executemany(
+            "INSERT INTO revisions (uid, changed_at, old_begin, new_begin) VALUES (?, ?, ?, ?)",
+            revs,
+        )
+        # 바뀐 / 삭제된 uid → 변경 순번 (EventIndex.sync 가 마지막 순번 이후만 읽음)
+        conn.executemany(
+            "INSERT INTO event_changes (uid) VALUES (?)",
+            [(f[0],) for f in fresh] + [(uid,) for uid in gone],
+        )
+    conn.close()
+    kept = f", 이전 데이터 유지 {stale}개" if stale else ""
+    print(f"   💾 store[{source}] ← {len(events)}개 (변경 {len(revs)}{kept})")
+
+
+def store_query(start: datetime = None, end: datetime = None, groups=None) -> list:
+    """begin_utc 인덱스 범위 조회 (+ 그룹 필터) → 소스 간 merge 된 NQEvent 리스트."""
+    if not os.path.exists(DB_FILE):
+        print(f"   ⚠️ '{DB_FILE}' 없음 — scrape-ff / earnings 먼저 실행")
+        return []
+    sql = "SELECT data FROM events WHERE begin_utc >= ? AND begin_utc < ?"
+    params = [
+        int(start.timestamp()) if start else 0,
+        int(end.timestamp()) if end else 1 << 62,
+    ]
+    if groups:
+        sql += f" AND grp IN ({','.join('?' * len(groups))})"
+        params += list(groups)
+    conn = db_connect()
+    rows = conn.execute(sql + " ORDER BY begin_utc", params).fetchall()
+    conn.close()
+    return merge_sources(NQEvent.from_json(json.loads(d)) for d, in rows)
+
+
+def store_revisions(uid: str = None, limit: int = 50) -> list:
+    conn = db_connect()
+    sql = "SELECT uid, changed_at, old_begin, new_begin FROM revisions"
+    params = []
+    if uid:
+        sql += " WHERE uid = ?"
+        params.append(uid)
+    rows = conn.execute(sql + " ORDER BY id DESC LIMIT ?", params + [limit]).fetchall()
+    conn.close()
+    return rows
+
+
+def record_changes(events: list, window_start: datetime) -> list:
+    """
+    직전 렌더 (published) 대비 delta 기록 → changes 테이블 + CHANGES_FILE.
+    kind: added / rescheduled / removed / description
+    렌더 범위 밖으로 지나간 이벤트는 removed 아님.
+    """
+    import hashlib
+
+    now = utc_now_iso()
+    cur = {
+        e.uid: (e.name, e.begin_et.isoformat(),
+                hashlib.sha1(e.desc.encode()).hexdigest()[:16], e)
+        for e in events
+    }
+    conn = db_connect()
+    with conn:
+        prev = {uid: (name, begin, h) for uid, name, begin, h in conn.execute(
+            "SELECT uid, name, begin, desc_hash FROM published"
+        )}
+
+        deltas = []
+        for uid, (name, begin, h, evt) in cur.items():
+            if uid not in prev:
+                deltas.append({"kind": "added", "uid": uid, "name": name,
+                               "begin": begin, "desc": evt.desc})
                 continue
+            _, old_begin, old_h = prev[uid]
+            if old_begin != begin:
+                deltas.append({"kind": "rescheduled", "uid": uid, "name": name,
+                               "old_begin": old_begin, "begin": begin})
+            elif old_h != h:
+                # 시각 변경 시 설명도 바뀌므로 rescheduled 만 기록
+                deltas.append({"kind": "description", "uid": uid, "name": name,
+                               "begin": begin, "desc": evt.desc})
+        for uid, (name, begin, _) in prev.items():
+            if uid not in cur and datetime.fromisoformat(begin) >= window_start:
+                deltas.append({"kind": "removed", "uid": uid, "name": name, "begin": begin})
+
+        lines = []
+        for d in deltas:
+            payload = json.dumps(d, ensure_ascii=False)
+            seq = conn.execute(
+                "INSERT INTO changes (at, payload) VALUES (?, ?)", (now, payload)
+            ).lastrowid
+            lines.append(f'{{"seq": {seq}, "at": "{now}", {payload[1:]}\n')
+
+        conn.execute("DELETE FROM published")
+        conn.executemany(
+            "INSERT INTO published VALUES (?, ?, ?, ?)",
+            [(uid, name, begin, h) for uid, (name, begin, h, _) in cur.items()],
+        )
+    conn.close()
+
+    if lines:
+        with open(CHANGES_FILE, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+    kinds = {}
+    for d in deltas:
+        kinds[d["kind"]] = kinds.get(d["kind"], 0) + 1
+    print(f"   🔁 change feed: {kinds or '변경 없음'}")
+    return deltas
+
+
+def record_freshness(events: list):
+    """이번 ICS 에 처음 실린 변경 → published_at 기록 + 지연 (감지 → 배포) 샘플."""
+    now = utc_now_iso()
+    uids = {e.uid for e in events}
+    conn = db_connect()
+    with conn:
+        pending = [
+            row for row in conn.execute(
+                "SELECT uid, grp, change_kind, last_changed FROM freshness WHERE published_at IS NULL"
+            )
+            if row[0] in uids
+        ]
+        published = datetime.fromisoformat(now)
+        conn.executemany(
+            "INSERT INTO freshness_log (uid, grp, kind, detected_at, published_at, latency_s)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (uid, grp, kind, detected, now,
+                 (published - datetime.fromisoformat(detected)).total_seconds())
+                for uid, grp, kind, detected in pending
+            ],
+        )
+        conn.executemany(
+            "UPDATE freshness SET published_at = ? WHERE uid = ?",
+            [(now, uid) for uid, *_ in pending],
+        )
+    conn.close()
+
+
+def percentile(sorted_vals: list, p: float) -> float:
+    """nearest-rank percentile (정렬된 리스트)."""
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[max(1, math.ceil(len(sorted_vals) * p)) - 1]
+
+
+def freshness_stats(days: int = 30) -> dict:
+    """최근 N일 감지 → 배포 지연 분포 (전체 + 변경 종류 / 그룹별) + 미배포 변경 수."""
+    if not os.path.exists(DB_FILE):
+        return {"count": 0, "pending": 0, "by_kind": {}, "by_group": {}}
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat(timespec="seconds")
+    conn = db_connect()
+    rows = conn.execute(
+        "SELECT kind, grp, latency_s FROM freshness_log WHERE published_at >= ?", (since,)
+    ).fetchall()
+    pending = conn.execute(
+        "SELECT COUNT(*) FROM freshness WHERE published_at IS NULL"
+    ).fetchone()[0]
+    conn.close()
+
+    def dist(vals):
+        vals = sorted(vals)
+        return {"count": len(vals), "p50": percentile(vals, 0.5),
+                "p95": percentile(vals, 0.95), "max": vals[-1] if vals else 0.0}
+
+    by_kind, by_group = {}, {}
+    for kind, grp, lat in rows:
+        by_kind.setdefault(kind, []).append(lat)
+        by_group.setdefault(grp, []).append(lat)
+    return {
+        **dist([r[2] for r in rows]), "pending": pending,
+        "by_kind": {k: dist(v) for k, v in sorted(by_kind.items())},
+        "by_group": {g: dist(v) for g, v in sorted(by_group.items())},
+    }
+
+
+def fmt_secs(sec: float) -> str:
+    if sec < 120:
+        return f"{sec:.0f}s"
+    if sec < 7200:
+        return f"{sec / 60:.0f}m"
+    return f"{sec / 3600:.1f}h"
+
+
+def read_changes(since: int = 0, limit: int = 1000) -> list:
+    """seq > since 인 delta (PK 범위 조회 → O(delta))."""
+    if not os.path.exists(DB_FILE):
+        return []
+    conn = db_connect()
+    rows = conn.execute(
+        "SELECT seq, at, payload FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+        (since, limit),
+    ).fetchall()
+    conn.close()
+    return [{"seq": seq, "at": at, **json.loads(p)} for seq, at, p in rows]
+
+
+def render_start() -> datetime:
+    """렌더 범위 시작: 오늘 00:00 ET."""
+    return ET_TZ.localize(datetime.combine(datetime.now(ET).date(), dt_time(0, 0)))
 
-            # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-            # 날짜 추출 (수정됨)
-            # yfinance 실적일 = 달력 날짜.
-            # 자정 데이터를 UTC→ET 변환하면 -1일 버그 발생.
-            # → 자정이면 timezone 변환 없이 날짜만 추출.
-            # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-            if isinstance(earn_date, pd.Timestamp):
-                earn_date = earn_date.to_pydatetime()
-
-            if isinstance(earn_date, date) and not isinstance(earn_date, datetime):
-                # date 객체 → 그대로 사용
-                d = earn_date
-            elif earn_date.hour == 0 and earn_date.minute == 0:
-                # 자정 = 달력 날짜 placeholder → 날짜만 추출
-                d = earn_date.date()
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 6. SERVE — 렌더된 ICS / store 를 HTTP 로 제공
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def freshness_metrics(days: int = 30) -> str:
+    """Prometheus text format — 감지 → 배포 지연 분위수 / 최대 / 미배포 변경 수."""
+    st = freshness_stats(days)
+    lines = [
+        "# HELP nq_freshness_latency_seconds Change detected (scrape) to first published ICS.",
+        "# TYPE nq_freshness_latency_seconds summary",
+    ]
+    def series(name, labels, value):
+        inner = ",".join(f'{k}="{v}"' for k, v in labels.items())
+        lines.append(f"{name}{{{inner}}} {value}" if inner else f"{name} {value}")
+
+    for labels, d in [({}, st)] + [({"kind": k}, v) for k, v in st["by_kind"].items()]:
+        if not d["count"]:
+            continue
+        series("nq_freshness_latency_seconds", {**labels, "quantile": "0.5"}, f"{d['p50']:.0f}")
+        series("nq_freshness_latency_seconds", {**labels, "quantile": "0.95"}, f"{d['p95']:.0f}")
+        series("nq_freshness_latency_seconds_count", labels, d["count"])
+        series("nq_freshness_latency_max_seconds", labels, f"{d['max']:.0f}")
+    lines.append(f"nq_freshness_pending_changes {st['pending']}")
+    return "\n".join(lines) + "\n"
+
+
+def serve(port: int = SERVE_PORT):
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    from urllib.parse import urlsplit, parse_qs
+
+    def events_json(query: dict) -> bytes:
+        # /events.json?from=2026-11-01&to=2026-12-01&group=cpi&group=fomc&max_tier=1
+        # /events.json?hours=4  /  /events.json?next=5&group=cpi   (EventIndex, O(log n + k))
+        day = lambda k: ET_TZ.localize(datetime.fromisoformat(query[k][0])) if k in query else None
+        groups = query.get("group")
+        max_tier = int(query["max_tier"][0]) if "max_tier" in query else None
+        index = event_index()
+        if "next" in query:
+            events = index.upcoming(int(query["next"][0]), day("from"), groups, max_tier)
+        elif "hours" in query:
+            now = datetime.now(timezone.utc)
+            events = index.between(now, now + timedelta(hours=float(query["hours"][0])), groups, max_tier)
+        else:
+            events = index.between(day("from") or render_start(), day("to"), groups, max_tier)
+        return json.dumps([e.to_json() for e in events], ensure_ascii=False).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            encoding = None
+            if url.path == "/events.json":
+                try:
+                    body = events_json(parse_qs(url.query))
+                except ValueError:
+                    self.send_error(400)
+                    return
+                ctype = "application/json; charset=utf-8"
+            elif url.path == "/changes":
+                # /changes?since=<seq> → JSON lines
+                try:
+                    since = int(parse_qs(url.query).get("since", ["0"])[0])
+                except ValueError:
+                    self.send_error(400)
+                    return
+                body = "".join(
+                    json.dumps(c, ensure_ascii=False) + "\n" for c in read_changes(since)
+                ).encode()
+                ctype = "application/x-ndjson; charset=utf-8"
+            elif url.path == "/metrics":
+                body = freshness_metrics().encode()
+                ctype = "text/plain; version=0.0.4"
+            elif url.path in ("/", f"/{OUTPUT_FILE}") and os.path.exists(OUTPUT_FILE):
+                # 미리 압축된 .br / .gz 가 있으면 그대로 (요청마다 압축 안 함)
+                accept = self.headers.get("Accept-Encoding", "")
+                path = OUTPUT_FILE
+                for suffix, enc in ((".br", "br"), (".gz", "gzip")):
+                    if enc in accept and os.path.exists(OUTPUT_FILE + suffix):
+                        path, encoding = OUTPUT_FILE + suffix, enc
+                        break
+                with open(path, 'rb') as f:
+                    body = f.read()
+                ctype = "text/calendar; charset=utf-8"
             else:
-                # 구체적 시간 있음 → ET 변환 후 날짜 추출
-                if earn_date.tzinfo is None:
-                    earn_date = pytz.utc.localize(earn_date)
-                d = earn_date.astimezone(ET).date()
-
-            dt_et  = ET.localize(datetime.combine(d, dt_time(9, 30)))
-            dt_hkt = dt_et.astimezone(HKT)
-
-            results.append({
-                "name": f"💰 {sym} Earnings",
-                "begin_hkt": dt_hkt,
-                "begin_et":  dt_et,
-                "tier": 1,
-                "ff_name": f"{sym} Earnings",
-                "is_earnings": True,
-                "desc": (
-                    f"💰 {sym} Earnings\n"
-                    f"⏰ ET: {dt_et.strftime('%Y-%m-%d %I:%M %p')}\n"
-                    f"🇭🇰 HKT: {dt_hkt.strftime('%Y-%m-%d %H:%M')}"
-                ),
-            })
-            print(f"   ✅ {sym}: {d}")
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            print(f"   🌐 {self.address_string()} {fmt % args}")
+
+    httpd = ThreadingHTTPServer(("", port), Handler)
+    print(f"🌐 http://localhost:{port}/  ({OUTPUT_FILE}, /events.json, /changes?since=N, /metrics)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 7. STARTUP BENCHMARK (python -X importtime)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def import_time_ms(modules: list) -> float:
+    """새 인터프리터에서 main + modules import 누적 시간 (ms)."""
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = "import main" + "".join(f"; import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=here, capture_output=True, text=True,
+    )
+    wanted = {"main", *modules}
+    total = 0
+    for line in proc.stderr.splitlines():
+        # "import time: self | cumulative | name" — main 과 요청 모듈의 누적값만
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() in wanted and parts[1].strip().isdigit():
+            total += int(parts[1])
+    return total / 1000
+
+
+def bench_startup() -> bool:
+    print("\n⏱️ Import-time benchmark")
+    ok = True
+    for cmd, deps in COMMAND_DEPS.items():
+        ms = min(import_time_ms(deps) for _ in range(3))
+        budget = STARTUP_BUDGET_MS.get(cmd)
+        flag = ""
+        if budget is not None:
+            flag = "✅" if ms <= budget else "❌"
+            ok = ok and ms <= budget
+        limit = f"(≤ {budget}ms)" if budget else ""
+        print(f"   {cmd:<10} {ms:>8.1f}ms  {flag} {limit}  {', '.join(deps) or '-'}")
+    return ok
 
-        except Exception as e:
-            print(f"   ❌ {sym}: {e}")
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 8. EVENT SOURCES — 플러그인 + 병렬 수집
+# 새 소스: EventSource 상속 + @register_source + SOURCES 에 이름 추가
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SOURCE_REGISTRY = {}
+
+
+def register_source(cls):
+    SOURCE_REGISTRY[cls.name] = cls
+    return cls
+
+
+class EventSource:
+    name = ""
+    covered = None    # 이번에 새로 받은 FF 페이지 (연, 월) 집합 — None = 전체
+
+    def fetch(self) -> list:
+        """NQEvent 리스트 반환."""
+        raise NotImplementedError
+
+
+@register_source
+class ForexFactorySource(EventSource):
+    name = "ff"
+
+    def fetch(self) -> list:
+        rows = []
+        self.covered = set()
+        events = fetch_forex_events(rows, self.covered)
+        store_ff_rows(rows)
+        return events
+
+
+@register_source
+class EarningsSource(EventSource):
+    name = "earnings"
+
+    def fetch(self) -> list:
+        return fetch_earnings(get_top_tickers())
+
+
+@register_source
+class OpexSource(EventSource):
+    """월물 옵션 만기 (셋째 금요일) — 로컬 계산, 분기월은 Quad Witching."""
+    name = "opex"
+
+    def fetch(self) -> list:
+        today = datetime.now(ET).date()
+        events = []
+        y, m = today.year, today.month
+        for _ in range(FUTURE_MONTHS + 1):
+            first = date(y, m, 1)
+            # 셋째 금요일이 휴장 (성금요일 등) 이면 전 개장일로 당겨짐
+            d = trading_day_on_or_after(first + timedelta(days=(4 - first.weekday()) % 7 + 14), -1)
+            if d >= today:
+                quad = m in (3, 6, 9, 12)
+                events.append(NQEvent(
+                    "opex", "opex",
+                    "Quad Witching" if quad else "Monthly OPEX",
+                    "🎯", 1 if quad else 2,
+                    ET_TZ.localize(datetime.combine(d, dt_time(9, 30))),
+                ))
+            y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        return [e for e in events if e.tier <= MAX_TIER]
+
+
+@register_source
+class CsvSource(EventSource):
+    """로컬 CSV (Fed 연설, 국채 입찰 등). 파일 없으면 빈 리스트."""
+    name = "csv"
+
+    def fetch(self) -> list:
+        import csv
+
+        if not os.path.exists(EXTRA_EVENTS_CSV):
+            return []
+        today = datetime.now(ET).date()
+        events = []
+        with open(EXTRA_EVENTS_CSV, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    d = date.fromisoformat(row["date"])
+                    h, mn = (int(x) for x in (row.get("time_et") or "10:00").split(":"))
+                    tier = int(row.get("tier") or 2)
+                except (KeyError, ValueError) as e:
+                    print(f"   ⚠️ {EXTRA_EVENTS_CSV}: {row} ({e})")
+                    continue
+                if d < today or tier > MAX_TIER:
+                    continue
+                events.append(NQEvent(
+                    "csv", row.get("group") or "extra", row.get("display") or "Event",
+                    row.get("emoji") or "📌", tier,
+                    ET_TZ.localize(datetime.combine(d, dt_time(h, mn))),
+                ))
+        return events
+
+
+def collect_sources(names=None, coverage: dict = None) -> dict:
+    """
+    등록된 소스 병렬 실행 → {name: events}. 실패한 소스는 제외 (store 의 이전 데이터 유지).
+    coverage: {name: 새로 받은 범위} 를 채움 (store_save 의 covered).
+    """
+    names = [n for n in (names or SOURCES) if n in SOURCE_REGISTRY]
+    sources = {n: SOURCE_REGISTRY[n]() for n in names}
+    outcomes = {}
+
+    def run(n):
+        try:
+            outcomes[n] = (True, sources[n].fetch())
+        except Exception as e:
+            outcomes[n] = (False, e)
+
+    # 시간 예산까지만 기다림 — 멈춘 소스 (yfinance 등) 는 실패 처리하고 버림 (이전 데이터로 렌더)
+    threads = [threading.Thread(target=run, args=(n,), name=f"source-{n}", daemon=True) for n in names]
+    for t in threads:
+        t.start()
+    join_by_deadline(threads)
+
+    results = {}
+    for n in names:
+        if n not in outcomes:
+            print(f"   ⏱️ source[{n}]: 시간 예산 내 미완료 — 이전 데이터 사용")
+            continue
+        ok, value = outcomes[n]
+        if not ok:
+            print(f"   ❌ source[{n}]: {value} — 이전 데이터 사용")
+            continue
+        results[n] = value
+        if coverage is not None:
+            coverage[n] = sources[n].covered
     return results
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 3. ICS 생성 (Earnings 알람 수정)
+# 9. BACKFILL — 과거 월 페이지 → 컬럼형 DataFrame
+# 파싱은 프로세스 풀, 매칭 / 날짜 보정 / dedup / TZ 변환은 벡터 연산
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def generate_ics(events: list):
-    cal = Calendar()
+def archive_path(year: int, month: int) -> str:
+    return os.path.join(BACKFILL_DIR, f"{year:04d}-{month:02d}.html.gz")
 
-    for evt in events:
-        e = Event()
-        e.name = evt["name"]
-        e.begin = evt["begin_hkt"]
-        e.duration = timedelta(minutes=30)
-        e.description = evt["desc"]
-
-        # 경제 지표: 30분 전 알람 (Earnings는 스킵)
-        if not evt.get("is_earnings"):
-            e.alarms.append(DisplayAlarm(trigger=timedelta(minutes=-30)))
-
-        # 장준비 알람 (8:30 AM ET) — 모든 이벤트 공통
-        prep_et  = ET.localize(
-            datetime.combine(evt["begin_et"].date(), MARKET_PREP_ET)
-        )
-        prep_hkt = prep_et.astimezone(HKT)
-        offset   = prep_hkt - evt["begin_hkt"]
 
-        if offset < timedelta(0):
-            e.alarms.append(DisplayAlarm(trigger=offset))
+def parse_archived_month(ym: tuple) -> list:
+    """프로세스 풀 작업 단위."""
+    import gzip
 
-        cal.events.add(e)
+    with gzip.open(archive_path(*ym), 'rb') as f:
+        return parse_page_rows(iter(lambda: f.read(STREAM_CHUNK), b""), *ym)
 
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.writelines(cal.serialize_iter())
 
-    print(f"\n🚀 '{OUTPUT_FILE}' 생성 완료 ({len(events)}개)")
+def fetch_archive(months: list):
+    """보관본 없는 달 (+ 아직 안 끝난 이번 달 이후) 만 다운로드."""
+    import cloudscraper
+    import gzip
+
+    today = date.today()
+    todo = [
+        (y, m) for y, m in months
+        if not os.path.exists(archive_path(y, m)) or (y, m) >= (today.year, today.month)
+    ]
+    if not todo:
+        return
+    os.makedirs(BACKFILL_DIR, exist_ok=True)
+    scraper = cloudscraper.create_scraper()
+    print(f"   📡 {len(todo)}개월 다운로드 ({len(months) - len(todo)}개월 보관본 사용)")
+
+    for y, m in todo:
+        url = ff_month_url(y, m)
+        try:
+            tmp = archive_path(y, m) + ".tmp"
+            found, tail = False, b""
+            # 청크 단위로 바로 gzip 에 기록 — 경계에 걸친 표시자는 tail 로 이어 검사
+            with scraper.get(url, timeout=15, stream=True) as resp, gzip.open(tmp, 'wb') as f:
+                for chunk in resp.iter_content(STREAM_CHUNK):
+                    found = found or b'calendar__table' in tail + chunk
+                    tail = chunk[-16:]
+                    f.write(chunk)
+            if not found:
+                os.remove(tmp)
+                print(f"      ⚠️ {y}-{m:02d}: 테이블 없음")
+                continue
+            os.replace(tmp, archive_path(y, m))
+        except Exception as e:
+            print(f"      ❌ {y}-{m:02d}: {e}")
+        time_module.sleep(0.3)
+
+
+def classify_frame(df):
+    """
+    FF 행 DataFrame → NQ 이벤트 DataFrame.
+    fetch_forex_events 와 같은 규칙 (통화별 EVENTS_DEF 매칭, 지역 현지 날짜 보정, 월별 dedup) 을 벡터 연산으로.
+    """
+    import pandas as pd
+
+    # 페이지 경계 중복 없음 — 각 날짜는 그 달 페이지만 파싱 (page_owns)
+    lower = df["ff_name"].str.lower()
+    df = df[~lower.str.contains("|".join(map(re.escape, BLACKLIST)))]
+
+    columns = ["et_date", "begin_et", "begin_utc", "group", "display", "tier",
+               "ff_name", "actual", "forecast", "previous", "ff_date", "currency"]
+    matched = {}
+    for currency in EVENTS_DEF:
+        m = _match_region(df[df["currency"] == currency], currency)
+        if len(m):
+            matched[currency] = m
+    if not matched:
+        return pd.DataFrame(columns=columns)
+
+    # FF 표시 zone: calibrate_ff_zone 과 같은 규칙 (Known Time 행이 가장 많이 맞는 후보, DST 반영)
+    ff_zone = _detect_zone(matched)
+    print(f"   🕐 FF timezone = {ff_zone}")
+
+    df = pd.concat([_localize_region(m, cur, ff_zone) for cur, m in matched.items()])
+    df = df.assign(et_date=df["begin_et"].dt.tz_localize(None).dt.normalize())
+
+    # 월 1회 그룹: (연, 월, 그룹) 중 가장 늦은 날짜 / 그 외: (날짜, 그룹) 첫 행
+    monthly = df["group"].isin(MONTHLY_GROUPS)
+    ym = [df["et_date"].dt.year, df["et_date"].dt.month, df["group"]]
+    latest = df.groupby(ym)["et_date"].transform("max")
+    df = pd.concat([
+        df[monthly & (df["et_date"] == latest)].drop_duplicates(["et_date", "group"]),
+        df[~monthly].drop_duplicates(["et_date", "group"]),
+    ])
+
+    return (
+        df[columns]
+        .sort_values("begin_utc")
+        .reset_index(drop=True)
+    )
+
+
+def _match_region(df, currency: str):
+    """한 통화의 FF 행 → EVENTS_DEF 매칭 + FF 시간 (ff_h / ff_m / ok)."""
+    import numpy as np
+    import pandas as pd
+
+    lower = df["ff_name"].str.lower()
+    defs_list = EVENTS_DEF[currency]
+
+    # EVENTS_DEF 순서대로 첫 매칭
+    cfg_idx = pd.Series(-1, index=df.index)
+    for i, cfg in enumerate(defs_list):
+        if cfg["tier"] > MAX_TIER:
+            continue
+        hit = lower.str.contains("|".join(map(re.escape, cfg["match"])))
+        if "also_require" in cfg:
+            hit &= lower.str.contains("|".join(map(re.escape, cfg["also_require"])))
+        cfg_idx = cfg_idx.mask((cfg_idx < 0) & hit, i)
+
+    defs = pd.DataFrame([
+        {"group": c["group"], "display": c["display"], "emoji": c["emoji"], "tier": c["tier"],
+         "known_h": c["time"][0] if c["time"] else np.nan,
+         "known_m": c["time"][1] if c["time"] else np.nan}
+        for c in defs_list
+    ])
+    df = df[cfg_idx >= 0].join(defs, on=cfg_idx[cfg_idx >= 0].rename("cfg"))
+
+    # FF 시간 → (h, m, ok)
+    t = df["time_text"].str.strip().str.lower().str.extract(r'^(\d{1,2}):(\d{2})(am|pm)')
+    return df.assign(
+        ff_h=t[0].astype(float) % 12 + np.where(t[2] == "pm", 12, 0),
+        ff_m=t[1].astype(float), ok=t[0].notna(),
+    )
+
+
+def _tz_localize(wall, zone: str):
+    """벽시계 → aware (pytz is_dst=False 와 동일: 겹치면 표준시, 없는 시각은 +1h)."""
+    import numpy as np
+    import pandas as pd
+
+    return wall.dt.tz_localize(
+        zone,
+        ambiguous=np.zeros(len(wall), dtype=bool),
+        nonexistent=pd.Timedelta(hours=1),
+    )
+
+
+def _ff_wall(df):
+    import numpy as np
+    import pandas as pd
+
+    return (pd.to_datetime(df["ff_date"])
+            + pd.to_timedelta(np.nan_to_num(df["ff_h"].to_numpy()), unit="h")
+            + pd.to_timedelta(np.nan_to_num(df["ff_m"].to_numpy()), unit="m"))
+
+
+def _detect_zone(matched: dict) -> str:
+    """통화별 매칭 행 → FF 표시 zone (FF_ZONE_CANDIDATES 중 Known Time 행이 가장 많이 맞는 것, 없으면 ET)."""
+    known = {cur: m[m["ok"] & m["known_h"].notna()] for cur, m in matched.items()}
+    total = sum(len(k) for k in known.values())
+    zone, hits = ET_TZ.name, 0
+    for name in FF_ZONE_CANDIDATES if total else ():
+        n = 0
+        for cur, k in known.items():
+            local = _tz_localize(_ff_wall(k), name).dt.tz_convert(REGIONS[cur])
+            n += int(((local.dt.hour == k["known_h"]) & (local.dt.minute == k["known_m"])).sum())
+        if n > hits:
+            zone, hits = name, n
+        if n == total:
+            break
+    return zone
+
+
+def _localize_region(df, currency: str, ff_zone: str):
+    """
+    지역 현지 날짜 / 시각 보정 (region_local_time 과 동일) → ET aware (begin_et / begin_utc).
+    Known Time: 그날 발표 시각이 FF zone 에서 ff_date 로 보이는 지역 날짜, 시간 미정 지표: FF 벽시계를 FF zone 에서 변환.
+    """
+    import numpy as np
+    import pandas as pd
+
+    ok = df["ok"].to_numpy()
+    known = df["known_h"].notna().to_numpy()
+    ff_date = pd.to_datetime(df["ff_date"])
+    at = (pd.to_timedelta(np.nan_to_num(df["known_h"].to_numpy()), unit="h")
+          + pd.to_timedelta(np.nan_to_num(df["known_m"].to_numpy()), unit="m"))
+
+    # 지역 날짜 후보: 같은 날 → 전날 → 다음날 순 우선 (나중에 덮어쓴 쪽이 이김)
+    day = ff_date
+    for days in (-1, 1, 0):
+        d = ff_date - pd.Timedelta(days=days)
+        shown = _tz_localize(d + at, REGIONS[currency]).dt.tz_convert(ff_zone).dt.tz_localize(None).dt.normalize()
+        day = day.mask(shown == ff_date, d)
+
+    in_ff = ~known & ok
+    local_wall = (day + at).where(known, ff_date + pd.Timedelta(hours=10))
+    begin_et = (_tz_localize(local_wall, REGIONS[currency]).dt.tz_convert(ET_TZ.name)
+                .where(~in_ff, _tz_localize(_ff_wall(df), ff_zone).dt.tz_convert(ET_TZ.name)))
+    return df.assign(begin_et=begin_et, begin_utc=begin_et.dt.tz_convert("UTC"), currency=currency)
+
+
+def backfill(start: str, end: str, workers=None, out: str = BACKFILL_OUT):
+    from concurrent.futures import ProcessPoolExecutor
+    import pandas as pd
+
+    y, m = (int(x) for x in start.split("-"))
+    ey, em = (int(x) for x in end.split("-"))
+    months = []
+    while (y, m) <= (ey, em):
+        months.append((y, m))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+
+    print(f"\n📚 Backfill {start} → {end} ({len(months)}개월)")
+    t0 = time_module.time()
+    fetch_archive(months)
+    months = [ym for ym in months if os.path.exists(archive_path(*ym))]
+
+    t1 = time_module.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pages = list(pool.map(parse_archived_month, months, chunksize=4))
+    rows = [r for page in pages for r in (page or [])]
+    print(f"   🧩 {len(months)}페이지 → {len(rows)}행 파싱 ({time_module.time() - t1:.1f}s)")
+
+    events = classify_frame(pd.DataFrame(rows, columns=FF_ROW_COLUMNS))
+
+    try:
+        import pyarrow  # noqa: F401
+        path = out + ".parquet"
+        events.to_parquet(path, index=False)
+    except ImportError:
+        path = out + ".csv"
+        events.to_csv(path, index=False)
+
+    print(f"   📊 그룹별: {events['group'].value_counts().to_dict()}")
+    print(f"   ✅ {len(events)}개 이벤트 → '{path}' ({time_module.time() - t0:.1f}s)")
+    return events
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# MAIN
+# 10. BATCH RENDER — 구독자별 ICS (시간대 / tier / 그룹 / 티커 / 알람)
+# 공통 작업 (store 조회, UTC 시각) 1회, 현지 시각 + 설명 + 본문 직렬화는 시간대별, 알람 줄만 (시간대, 알람 정책) 별
+# 바뀐 이벤트만 (render_tz 캐시, 안 쓰는 프로필은 정리), 파일 쓰기는 프로세스 풀
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def main():
-    forex    = fetch_forex_events()
-    top      = get_top_tickers()
-    earnings = fetch_earnings(top)
+SUBSCRIBER_DEFAULTS = {
+    "tz": "Asia/Hong_Kong",
+    "max_tier": MAX_TIER,
+    "groups": None,           # None = 전체 (실적 제외 그룹 필터)
+    "tickers": None,          # None = store 의 실적 전체, [] = 실적 없음
+    "pre_alarm_min": 30,      # 0 = 30분 전 알람 없음
+    "prep_et": "08:30",       # 장준비 알람 (ET), None = 없음
+}
+
+# 구독자 id = 출력 파일 이름 ({id}.ics) — 경로 구분자 / '..' / 숨김 파일 불가
+SUBSCRIBER_ID_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+
+def load_subscribers(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        subs = [{**SUBSCRIBER_DEFAULTS, **s} for s in json.load(f)]
+    seen = set()
+    for s in subs:
+        if "id" not in s:
+            raise ValueError(f"{path}: id 없는 구독자 {s}")
+        sid = s["id"]
+        if not isinstance(sid, str) or not SUBSCRIBER_ID_RE.fullmatch(sid):
+            raise ValueError(f"{path}: 파일 이름으로 쓸 수 없는 구독자 id {sid!r}")
+        # 대소문자 무시 파일 시스템 (macOS / Windows) 에서도 덮어쓰지 않게
+        if sid.lower() in seen:
+            raise ValueError(f"{path}: 중복 구독자 id {sid!r}")
+        seen.add(sid.lower())
+        tz_table(s["tz"])
+    return subs
+
+
+def alarm_profile(sub: dict) -> tuple:
+    return (sub["pre_alarm_min"], sub["prep_et"])
+
+
+_BATCH = {}
+
+
+def _batch_init(meta: list, fragments: dict, out_dir: str):
+    _BATCH.update(meta=meta, fragments=fragments, out_dir=out_dir)
 
-    all_events = sorted(forex + earnings, key=lambda x: x["begin_hkt"])
 
+def _batch_write(subs: list) -> int:
+    """프로세스 풀 작업 단위: 구독자 묶음 → 필터 + fragment 이어붙이기 → 파일."""
+    meta, out_dir = _BATCH["meta"], _BATCH["out_dir"]
+    for sub in subs:
+        frags = _BATCH["fragments"][(sub["tz"], alarm_profile(sub))]
+        groups = set(sub["groups"]) if sub["groups"] is not None else None
+        tickers = {t.upper() for t in sub["tickers"]} if sub["tickers"] is not None else None
+        body = [ICS_HEADER]
+        for i, (group, tier, ticker, top) in enumerate(meta):
+            if tier > sub["max_tier"]:
+                continue
+            if ticker is not None:
+                if ticker not in tickers if tickers is not None else not top:
+                    continue
+            elif groups is not None and group not in groups:
+                continue
+            body.append(frags[i])
+        body.append(ICS_FOOTER)
+        write_atomic(os.path.join(out_dir, f"{sub['id']}.ics"), b"".join(body), sync=False)
+    return len(subs)
+
+
+def render_batch(path: str = SUBSCRIBERS_FILE, out_dir: str = BATCH_OUT_DIR, workers=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    t0 = time_module.time()
+    subs = load_subscribers(path)
+    events = store_query(render_start())
+
+    # 구독자 티커 중 store 에 없는 것만 한 번에 수집 (전원 공통)
+    have = {e.group[len("earnings_"):].upper() for e in events if e.source == "earnings"}
+    wanted = {t.upper() for s in subs for t in (s["tickers"] or [])}
+    if wanted - have:
+        events = merge_events(events, fetch_earnings(sorted(wanted - have)))
+
+    by_tz = {}
+    for s in subs:
+        by_tz.setdefault(s["tz"], set()).add(alarm_profile(s))
+    fragments = {}
+    for tz_name, profiles in by_tz.items():
+        for profile, frags in render_tz(events, tz_name, profiles, verbose=False).items():
+            fragments[(tz_name, profile)] = frags
+    vevent_cache_prune({profile_key(*key) for key in fragments} | {profile_key(HKT_TZ.name, DEFAULT_ALARMS)})
+    meta = []
+    for e in events:
+        ticker = e.group[len("earnings_"):].upper() if e.source == "earnings" else None
+        meta.append((e.group, e.tier, ticker, ticker in have))
+    t1 = time_module.time()
+    print(f"\n👥 구독자 {len(subs)}명 — 시간대 {len(by_tz)}개, (시간대, 알람) {len(fragments)}개"
+          f" × 이벤트 {len(events)}개 직렬화 ({t1 - t0:.1f}s)")
+
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    size = max(1, -(-len(subs) // (workers * 4)))
+    chunks = [subs[i:i + size] for i in range(0, len(subs), size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_batch_init,
+                             initargs=(meta, fragments, out_dir)) as pool:
+        written = sum(pool.map(_batch_write, chunks))
+    print(f"   ✅ {written}개 ICS → '{out_dir}/' ({time_module.time() - t1:.1f}s 쓰기, 워커 {workers})")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 11. EVENT INDEX — 시간 구간 / 다음 N 개 조회 (serve / 봇 / 알림)
+# 정렬 배열 (begin_utc, uid) + 그룹 / tier 보조 배열 → bisect 로 O(log n + k)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+EVENT_DURATION_SEC = 30 * 60    # VEVENT DURATION (PT30M) — 구간 겹침 판정용
+
+
+class EventIndex:
+    """
+    이벤트 시작 시각 정렬 배열 + 그룹 / tier 별 보조 배열 (모두 (begin_utc, source, uid) 정렬).
+    store 처럼 소스별로 따로 두고 조회 결과만 소스 간 merge (merge_sources).
+    구간 조회는 [시작 - 길이, 끝) 을 bisect 후 필요한 배열만 병합 → O(log n + k).
+    upsert / remove 는 바뀐 이벤트의 키만 옮김 (sync: store 에서 바뀐 행만 읽음).
+    """
+
+    def __init__(self, events=()):
+        self._events = {}       # (source, uid) → NQEvent
+        self._keys = {}         # (source, uid) → (begin_utc, source, uid)
+        self._uids = {}         # uid → {(source, uid)}
+        self._all = []
+        self._by_group = {}     # group → [(begin_utc, source, uid)]
+        self._by_tier = {}      # tier → [(begin_utc, source, uid)]
+        self._seq = None        # 반영한 마지막 event_changes 순번 (None = 아직 store 안 읽음)
+        self._lock = threading.RLock()
+        for e in events:
+            self._events[(e.source, e.uid)] = e       # 같은 (소스, uid) 는 마지막 것
+        for ident, e in self._events.items():
+            self._keys[ident] = key = (int(e.begin_et.timestamp()), *ident)
+            self._uids.setdefault(e.uid, set()).add(ident)
+            self._all.append(key)
+            self._by_group.setdefault(e.group, []).append(key)
+            self._by_tier.setdefault(e.tier, []).append(key)
+        for lst in (self._all, *self._by_group.values(), *self._by_tier.values()):
+            lst.sort()
+
+    def __len__(self):
+        return len(self._events)
+
+    def upsert(self, evt: "NQEvent"):
+        from bisect import insort
+
+        ident = (evt.source, evt.uid)
+        with self._lock:
+            if ident in self._events:
+                self.remove(evt.uid, evt.source)
+            key = (int(evt.begin_et.timestamp()), *ident)
+            self._events[ident] = evt
+            self._keys[ident] = key
+            self._uids.setdefault(evt.uid, set()).add(ident)
+            insort(self._all, key)
+            insort(self._by_group.setdefault(evt.group, []), key)
+            insort(self._by_tier.setdefault(evt.tier, []), key)
+
+    def remove(self, uid: str, source: str = None):
+        """uid 의 이벤트 제거 (source 지정 시 그 소스 것만)."""
+        from bisect import bisect_left
+
+        with self._lock:
+            idents = self._uids.get(uid, set())
+            for ident in [i for i in idents if source is None or i[0] == source]:
+                evt = self._events.pop(ident)
+                key = self._keys.pop(ident)
+                idents.discard(ident)
+                for lst in (self._all, self._by_group[evt.group], self._by_tier[evt.tier]):
+                    del lst[bisect_left(lst, key)]
+            if not idents:
+                self._uids.pop(uid, None)
+
+    def _lists(self, groups, max_tier):
+        """조회할 정렬 배열들 + 남은 필터 (그룹 지정 시 tier 는 필터로)."""
+        if groups:
+            lists = [self._by_group.get(g, []) for g in set(groups)]
+            keep = (lambda e: e.tier <= max_tier) if max_tier is not None else None
+            return lists, keep
+        if max_tier is not None:
+            return [lst for t, lst in self._by_tier.items() if t <= max_tier], None
+        return [self._all], None
+
+    def _scan(self, start_utc: int, groups, max_tier):
+        """start_utc 이후 시작 이벤트를 시각 순서로 (배열별 bisect 후 lazy 병합, 소스 merge 전)."""
+        import heapq
+        from bisect import bisect_left
+
+        lists, keep = self._lists(groups, max_tier)
+        # islice(lst, i, None) 는 앞 i 개를 건너뛰며 세므로 O(i) — 인덱스로 바로 시작
+        its = [map(lst.__getitem__, range(bisect_left(lst, (start_utc,)), len(lst))) for lst in lists]
+        for key in (heapq.merge(*its) if len(its) > 1 else its[0] if its else ()):
+            evt = self._events[key[1:]]
+            if keep is None or keep(evt):
+                yield key[0], evt
+
+    def between(self, start: datetime, end: datetime = None, groups=None, max_tier=None) -> list:
+        """[start, end) 과 겹치는 이벤트 (진행 중 포함, 소스 간 merge)."""
+        with self._lock:
+            lo = int(start.timestamp()) - EVENT_DURATION_SEC + 1
+            hi = int(end.timestamp()) if end else None
+            out = []
+            for begin, evt in self._scan(lo, groups, max_tier):
+                if hi is not None and begin >= hi:
+                    break
+                out.append(evt)
+            return merge_sources(out)
+
+    def upcoming(self, n: int, after: datetime = None, groups=None, max_tier=None) -> list:
+        """after (기본: 지금) 이후 시작하는 다음 n 개 (dedup 키 기준, 소스 간 merge)."""
+        after = after or datetime.now(timezone.utc)
+        with self._lock:
+            out, keys = [], set()
+            for _, evt in self._scan(int(after.timestamp()), groups, max_tier):
+                key = dedup_key(evt)
+                if key not in keys:
+                    if len(keys) == n:
+                        break
+                    keys.add(key)
+                out.append(evt)
+            return merge_sources(out)[:n]
+
+    def sync(self) -> bool:
+        """
+        store 와 맞춤 — event_changes 순번이 그대로면 조회 1번 (rowid 최대값) 으로 끝.
+        움직였으면 그 뒤에 바뀐 uid 의 행만 (소스별) 다시 읽음 — store 에 없는 소스 것은 remove.
+        """
+        if not os.path.exists(DB_FILE):
+            return False
+        conn = db_connect()
+        try:
+            conn.execute("BEGIN")      # 순번 / 행을 같은 스냅샷에서 읽음 (WAL)
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM event_changes").fetchone()[0]
+            with self._lock:
+                if seq == self._seq:
+                    return False
+                if self._seq is None:
+                    for d, in conn.execute("SELECT data FROM events"):
+                        self.upsert(NQEvent.from_json(json.loads(d)))
+                else:
+                    changed = [uid for uid, in conn.execute(
+                        "SELECT DISTINCT uid FROM event_changes WHERE seq > ?", (self._seq,))]
+                    for uid in changed:
+                        rows = conn.execute("SELECT source, data FROM events WHERE uid = ?", (uid,)).fetchall()
+                        live = {source for source, _ in rows}
+                        for source in {i[0] for i in self._uids.get(uid, ())} - live:
+                            self.remove(uid, source)
+                        for _, d in rows:
+                            self.upsert(NQEvent.from_json(json.loads(d)))
+                self._seq = seq
+                return True
+        finally:
+            conn.rollback()
+            conn.close()
+
+
+_INDEX = None
+
+
+def event_index() -> EventIndex:
+    """프로세스 공용 EventIndex (전체 이력) — 호출마다 store 변경분만 반영."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = EventIndex()
+    _INDEX.sync()
+    return _INDEX
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# MAIN
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def print_summary(all_events: list):
     print("\n" + "=" * 110)
     print(f"📅 NQ TRADING CALENDAR — {len(all_events)} events")
     print("=" * 110)
@@ -438,36 +3562,171 @@ def main():
     print("-" * 110)
 
     for evt in all_events:
-        hkt = evt['begin_hkt']
-        et  = evt['begin_et']
+        hkt = evt.begin_hkt
+        et  = evt.begin_et
         print(
             f"{hkt.strftime('%Y-%m-%d'):<12} "
             f"{hkt.strftime('%H:%M'):<7} "
             f"{et.strftime('%m/%d %I:%M%p'):<17} "
-            f"T{evt['tier']:<4} "
-            f"{evt['name']:<28} "
-            f"{evt.get('ff_name', '')}"
+            f"T{evt.tier:<4} "
+            f"{evt.name:<28} "
+            f"{evt.ff_name}"
         )
 
     print("=" * 110)
 
-    generate_ics(all_events)
 
-    fomc = [e for e in all_events if 'FOMC Rate' in e['name']]
+def print_alarm_check(all_events: list):
+    fomc = [e for e in all_events if 'FOMC Rate' in e.name]
     if fomc:
         fe = fomc[0]
-        prep = ET.localize(
-            datetime.combine(fe['begin_et'].date(), MARKET_PREP_ET)
-        ).astimezone(HKT)
-        a30 = fe['begin_hkt'] - timedelta(minutes=30)
+        prep = HKT_TZ.convert(ET_TZ.localize(
+            datetime.combine(fe.et_date, MARKET_PREP_ET)
+        ))
+        a30 = fe.begin_hkt - timedelta(minutes=30)
         print(f"\n🔍 알람 검증 (첫 FOMC):")
-        print(f"   이벤트:         {fe['begin_hkt'].strftime('%m/%d %H:%M HKT')}  ({fe['begin_et'].strftime('%m/%d %I:%M%p ET')})")
+        print(f"   이벤트:         {fe.begin_hkt.strftime('%m/%d %H:%M HKT')}  ({fe.begin_et.strftime('%m/%d %I:%M%p ET')})")
         print(f"   알람2 (장준비): {prep.strftime('%m/%d %H:%M HKT')}  (8:30AM ET)")
         print(f"   알람1 (30분전): {a30.strftime('%m/%d %H:%M HKT')}")
 
-    print("\n💡 알람: 30분 전 + 8:30AM ET (CPI/NFP는 동시라 30분만)")
+    print("\n💡 알람: 30분 전 + 8:30AM ET (CPI/NFP는 동시라 30분만, 미국 휴장일은 장준비 알람 없음)")
     print("⚠️  iPhone: 설정 → 캘린더 → 구독 캘린더 → '알림 제거' OFF")
 
 
+def cmd_collect(args, names=None):
+    set_deadline(getattr(args, "budget", RUN_BUDGET_SEC))
+    set_shared_dir(getattr(args, "shared", SHARED_DIR))
+    coverage = {}
+    for name, events in collect_sources(names, coverage).items():
+        store_save(name, events, coverage.get(name))
+
+
+def cmd_scrape_ff(args):
+    cmd_collect(args, ["ff"])
+
+
+def cmd_earnings(args):
+    cmd_collect(args, ["earnings"])
+
+
+def cmd_render(args):
+    all_events = store_query(render_start())
+    print_summary(all_events)
+    publish(all_events)
+    print_alarm_check(all_events)
+
+
+def cmd_revisions(args):
+    rows = store_revisions(args.uid, args.limit)
+    print(f"\n🗂️ 변경 이력 ({len(rows)}건)")
+    for uid, changed_at, old_begin, new_begin in rows:
+        print(f"   {changed_at}  {uid:<28} {old_begin or '(신규)'} → {new_begin or '(삭제)'}")
+
+
+def cmd_freshness(args):
+    st = freshness_stats(args.days)
+    print(f"\n⏱️ Freshness (감지 → 배포, 최근 {args.days}일) — 미배포 변경 {st['pending']}개")
+    rows = [("전체", st)] + list(st["by_kind"].items()) + list(st["by_group"].items())
+    for label, d in rows:
+        if d["count"]:
+            print(f"   {label:<14} n={d['count']:<5} p50 {fmt_secs(d['p50']):>6}"
+                  f"   p95 {fmt_secs(d['p95']):>6}   max {fmt_secs(d['max']):>6}")
+
+
+def cmd_changes(args):
+    for c in read_changes(args.since, args.limit):
+        print(json.dumps(c, ensure_ascii=False))
+
+
+def cmd_upcoming(args):
+    index = event_index()
+    if args.hours is not None:
+        now = datetime.now(timezone.utc)
+        events = index.between(now, now + timedelta(hours=args.hours), args.group, args.max_tier)
+    else:
+        events = index.upcoming(args.n, None, args.group, args.max_tier)
+    print(f"\n⏭️ 다음 이벤트 ({len(events)}개 / 색인 {len(index)}개)")
+    for e in events:
+        print(f"   {e.begin_et.strftime('%m/%d %I:%M%p ET')}  T{e.tier}  {e.name:<28} {e.uid}")
+
+
+def cmd_all(args):
+    cmd_collect(args)
+    cmd_render(args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NQ Trading Calendar")
+    sub = parser.add_subparsers(dest="command")
+    budget = argparse.ArgumentParser(add_help=False)
+    budget.add_argument("--budget", type=float, default=RUN_BUDGET_SEC,
+                        help="수집 시간 예산 (초, 0 = 무제한)")
+    budget.add_argument("--shared", default=SHARED_DIR, metavar="DIR",
+                        help="여러 runner 협업 수집용 공유 디렉터리 (FF 월 페이지 lease)")
+    sub.add_parser("all", parents=[budget], help="collect + render (기본값)")
+    p = sub.add_parser("collect", parents=[budget], help="전체 소스 병렬 수집 → store")
+    p.add_argument("--source", action="append", choices=sorted(SOURCE_REGISTRY))
+    sub.add_parser("scrape-ff", parents=[budget], help="ForexFactory 수집 → store")
+    sub.add_parser("earnings", parents=[budget], help="빅테크 실적일 수집 → store")
+    sub.add_parser("render", help="store → ICS")
+    p = sub.add_parser("serve", help="ICS / store HTTP 제공")
+    p.add_argument("--port", type=int, default=SERVE_PORT)
+    sub.add_parser("release", help="Release-day 폴링")
+    p = sub.add_parser("changes", help="change feed (seq > since) JSON lines 출력")
+    p.add_argument("--since", type=int, default=0)
+    p.add_argument("--limit", type=int, default=1000)
+    p = sub.add_parser("revisions", help="이벤트 일정 변경 이력")
+    p.add_argument("--uid")
+    p.add_argument("--limit", type=int, default=50)
+    p = sub.add_parser("render-batch", help="구독자 설정 파일 → 구독자별 ICS 일괄 렌더")
+    p.add_argument("--subscribers", default=SUBSCRIBERS_FILE)
+    p.add_argument("--out", default=BATCH_OUT_DIR)
+    p.add_argument("--workers", type=int, default=None)
+    p = sub.add_parser("upcoming", help="다음 N 개 / 앞으로 H 시간 이벤트 (EventIndex)")
+    p.add_argument("-n", type=int, default=10)
+    p.add_argument("--hours", type=float)
+    p.add_argument("--group", action="append")
+    p.add_argument("--max-tier", type=int)
+    p = sub.add_parser("freshness", help="변경 감지 → ICS 배포 지연 (p50/p95/max)")
+    p.add_argument("--days", type=int, default=30)
+    sub.add_parser("bench-startup", help="서브커맨드별 import 시간 측정")
+    p = sub.add_parser("backfill", help="과거 FF 월 페이지 → 컬럼형 이벤트 테이블")
+    p.add_argument("--from", dest="start", required=True, metavar="YYYY-MM")
+    p.add_argument("--to", dest="end", required=True, metavar="YYYY-MM")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--out", default=BACKFILL_OUT)
+    args = parser.parse_args(argv)
+
+    if args.command == "collect":
+        cmd_collect(args, args.source)
+    elif args.command == "scrape-ff":
+        cmd_scrape_ff(args)
+    elif args.command == "earnings":
+        cmd_earnings(args)
+    elif args.command == "render":
+        cmd_render(args)
+    elif args.command == "serve":
+        serve(args.port)
+    elif args.command == "release":
+        release_day()
+    elif args.command == "changes":
+        cmd_changes(args)
+    elif args.command == "revisions":
+        cmd_revisions(args)
+    elif args.command == "render-batch":
+        render_batch(args.subscribers, args.out, args.workers)
+    elif args.command == "upcoming":
+        cmd_upcoming(args)
+    elif args.command == "freshness":
+        cmd_freshness(args)
+    elif args.command == "backfill":
+        backfill(args.start, args.end, args.workers, args.out)
+    elif args.command == "bench-startup":
+        if not bench_startup():
+            sys.exit(1)
+    else:
+        cmd_all(args)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
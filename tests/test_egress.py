@@ -0,0 +1,142 @@
+"""EgressPool — 로컬 http.server 대역 프록시로 가중 분산 / circuit open / half-open 복구 검증."""
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+pytest.importorskip("cloudscraper")
+
+PAGE = (
+    b'<html><body><table class="calendar__table">'
+    b'<tr><td class="calendar__date"><span>Thu</span> <span>Oct 15</span></td>'
+    b'<td class="calendar__time">8:30am</td><td class="calendar__currency">USD</td>'
+    b'<td class="calendar__event">CPI m/m</td><td class="calendar__actual"></td>'
+    b'<td class="calendar__forecast">0.3%</td><td class="calendar__previous">0.4%</td></tr>'
+    b'</table></body></html>'
+)
+CHALLENGE = b"<html><body>Just a moment...</body></html>"
+
+
+class StandIn:
+    """FF 대신 응답하는 HTTP 프록시. mode: "ok" (캘린더 페이지) / "challenge" (테이블 없음)."""
+
+    def __init__(self, delay=0.0, mode="ok"):
+        self.delay, self.mode, self.hits = delay, mode, 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.hits += 1
+                time.sleep(stand_in.delay)
+                body = PAGE if stand_in.mode == "ok" else CHALLENGE
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def refused_url() -> str:
+    """연결이 거부되는 프록시 주소 (닫힌 포트)."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+@pytest.fixture(autouse=True)
+def plain_http(monkeypatch):
+    # 대역 프록시는 CONNECT (TLS) 없이 절대 URL GET 만 받음
+    monkeypatch.setattr(main, "ff_month_url", lambda y, m: f"http://ff.test/calendar?month={y}-{m:02d}")
+    monkeypatch.setattr(main, "pace", lambda seconds=0.3: None)
+    monkeypatch.setattr(main, "_PARSE_WORKERS", None)
+
+
+@pytest.fixture
+def proxies():
+    started = []
+
+    def start(**kw):
+        started.append(StandIn(**kw))
+        return started[-1]
+
+    yield start
+    for p in started:
+        p.close()
+
+
+def test_weighted_spread(proxies):
+    fast, slow = proxies(), proxies(delay=0.3)
+    pool = main.EgressPool([fast.url, slow.url])
+    random.seed(7)
+    for _ in range(40):
+        assert pool.fetch((2026, 10)) is not None
+    a, b = pool.endpoints
+    assert (a.requests, b.requests) == (fast.hits, slow.hits)
+    assert a.weight() > 3 * b.weight()
+    assert a.requests > 2 * b.requests
+
+
+def test_circuit_opens_after_break_fails(proxies, monkeypatch):
+    monkeypatch.setattr(main, "EGRESS_COOLDOWN_SEC", 60)
+    bad = refused_url()
+    pool = main.EgressPool([bad])
+    ep = pool.endpoints[0]
+    for i in range(main.EGRESS_BREAK_FAILS):
+        assert ep.open_until == 0.0
+        assert pool.fetch((2026, 10)) is None
+    assert ep.failures == main.EGRESS_BREAK_FAILS and ep.open_until > time.monotonic()
+
+    # open 동안은 요청하지 않고 바로 None
+    assert pool.fetch((2026, 10)) is None
+    assert ep.requests == main.EGRESS_BREAK_FAILS
+
+    # 같은 풀의 건강한 endpoint 로 넘어감
+    ok = proxies()
+    pool = main.EgressPool([bad, ok.url])
+    pool.endpoints[0].open_until = time.monotonic() + 60
+    for _ in range(5):
+        assert pool.fetch((2026, 10)) is not None
+    assert ok.hits == 5 and pool.endpoints[0].requests == 0
+
+
+def test_half_open_recovery(proxies, monkeypatch):
+    monkeypatch.setattr(main, "EGRESS_COOLDOWN_SEC", 0.5)
+    flaky = proxies(mode="challenge")
+    pool = main.EgressPool([flaky.url])
+    ep = pool.endpoints[0]
+    for _ in range(main.EGRESS_BREAK_FAILS):
+        assert pool.fetch((2026, 10)) is None
+    assert ep.open_until > time.monotonic()
+
+    # cooldown 뒤 시험 요청 실패 → 한 번에 다시 open
+    time.sleep(0.6)
+    hits = flaky.hits
+    assert pool.fetch((2026, 10)) is None
+    assert flaky.hits == hits + 1 and ep.open_until > time.monotonic()
+
+    # 복구된 뒤 시험 요청 성공 → closed, 연속 실패 초기화
+    flaky.mode = "ok"
+    assert pool.fetch((2026, 10)) is None       # 아직 cooldown 중
+    time.sleep(0.6)
+    assert pool.fetch((2026, 10)) is not None
+    assert ep.failures == 0 and ep.open_until == 0.0
+    assert pool.fetch((2026, 10)) is not None
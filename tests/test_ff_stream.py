@@ -0,0 +1,134 @@
+"""FFRowStream 증분 파싱 검증 — 이전 BeautifulSoup 추출 결과와 청크 크기 (1 byte ~ 페이지 전체) 별 비교."""
+import calendar
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+def bs4_rows(html: bytes, page_year: int, page_month: int):
+    """user-032 까지의 bs4 추출 (기준값) + 페이지 소유권 필터."""
+    from bs4 import BeautifulSoup
+
+    table = BeautifulSoup(html, "html.parser").find("table", class_="calendar__table")
+    if not table:
+        return None
+
+    def row_date(row, cur_date):
+        for cell in row.find_all(["td", "th"]):
+            if "calendar__event" in (cell.get("class") or []):
+                continue
+            dm = main.DATE_RE.search(cell.get_text(" ", strip=True))
+            mn = main.MONTH_MAP.get(dm.group(1).lower()) if dm else None
+            if not mn:
+                continue
+            yr = page_year - (mn == 12 and page_month == 1) + (mn == 1 and page_month == 12)
+            try:
+                candidate = date(yr, mn, int(dm.group(2)))
+            except ValueError:
+                continue
+            if cur_date is None or candidate >= cur_date:
+                return candidate
+        return cur_date
+
+    def cell_text(row, cls):
+        td = row.find("td", class_=cls)
+        return td.get_text(strip=True) if td else ""
+
+    rows, cur_date = [], None
+    for row in table.find_all("tr"):
+        cur_date = row_date(row, cur_date)
+        if cur_date is None or not main.page_owns(page_year, page_month, cur_date):
+            continue
+        currency, name = cell_text(row, "calendar__currency"), cell_text(row, "calendar__event")
+        if currency and name:
+            rows.append((cur_date, currency, name, cell_text(row, "calendar__time"),
+                         cell_text(row, "calendar__actual"), cell_text(row, "calendar__forecast"),
+                         cell_text(row, "calendar__previous")))
+    return rows
+
+
+EVENTS = [
+    ("USD", "8:30am", "Non-Farm Employment Change", "", "50K", "40K"),
+    ("USD", "", "Unemployment Rate", "4.4%", "4.3%", "4.3%"),
+    ("EUR", "4:00am", "CPI Flash Estimate y/y", "", "2.1%", ""),
+    ("GBP", "All Day", "Bank Holiday &amp; Markets Closed", "", "", ""),
+    ("JPY", "7:50pm", "BOJ Policy Rate — 日本銀行", "", "0.5%", "0.5%"),
+    ("CHF", "Tentative", "SNB Chairman Schlegel Speaks", "", "", ""),
+]
+
+
+def month_page(y: int, m: int) -> bytes:
+    """앞 / 뒤 달 spill-over, 날짜 셀은 하루 첫 행만, 중첩 테이블 / 엔티티 / 멀티바이트 포함."""
+    prev = date(y, m, 1) - timedelta(days=1)
+    nxt = date(y, m, calendar.monthrange(y, m)[1]) + timedelta(days=1)
+    days = [prev] + [date(y, m, d) for d in range(1, calendar.monthrange(y, m)[1] + 1)] + [nxt, nxt + timedelta(days=1)]
+    rows = []
+    for i, d in enumerate(days):
+        for j, (cur, t, name, a, f, p) in enumerate(EVENTS[i % 3:i % 3 + 3]):
+            date_cell = f"<span>{d:%a}</span> <span>{d:%b} {d.day}</span>" if j == 0 else ""
+            rows.append(
+                f'<tr class="calendar__row"><td class="calendar__cell calendar__date">{date_cell}</td>'
+                f'<td class="calendar__cell calendar__time"><div> {t} </div></td>'
+                f'<td class="calendar__cell calendar__currency">{cur}</td>'
+                f'<td class="calendar__cell calendar__impact"><table><tr><td>x</td></tr></table></td>'
+                f'<td class="calendar__cell calendar__event"><span class="calendar__event-title">{name}</span>'
+                f'<span>Mar 3</span></td>'
+                f'<td class="calendar__cell calendar__actual">{a}</td>'
+                f'<td class="calendar__cell calendar__forecast">{f}</td>'
+                f'<td class="calendar__cell calendar__previous">{p}</td></tr>'
+            )
+        if i % 5 == 0:
+            rows.append('<tr class="calendar__row calendar__row--day-breaker"><td colspan="8">&nbsp;</td></tr>')
+    html = (
+        "<html><head><title>Forex Factory — 캘린더</title></head><body>"
+        + "<div class='filler'>é</div>" * 50
+        + '<table class="calendar__table"><tr><th>Date</th><th>Time</th><th>Cur</th></tr>'
+        + "".join(rows)
+        + "</table><table><tr><td>Jan 9</td><td class='calendar__currency'>USD</td></tr></table></body></html>"
+    )
+    return html.encode("utf-8")
+
+
+def chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("ym", [(2026, 10), (2026, 12), (2027, 1)])
+@pytest.mark.parametrize("size", [1, 7, 64, 1000, main.STREAM_CHUNK, None])
+def test_stream_matches_bs4(ym, size):
+    pytest.importorskip("bs4")
+    page = month_page(*ym)
+    expected = bs4_rows(page, *ym)
+    assert expected and all(main.page_owns(*ym, r[0]) for r in expected)
+    assert main.parse_page_rows(chunks(page, size or len(page)), *ym) == expected
+
+
+def test_no_table():
+    assert main.parse_page_rows(b"<html><body>Just a moment...</body></html>", 2026, 10) is None
+
+
+def test_parse_workers_match_inline():
+    page = month_page(2026, 12)
+    expected = main.parse_page_rows(page, 2026, 12)
+    workers = main.ParseWorkers(2)
+    try:
+        for size in (1, 500, main.STREAM_CHUNK):
+            stream = workers.stream((2026, 12))
+            assert isinstance(stream, main.RemoteRowStream)
+            rows = []
+            for chunk in chunks(page, size):
+                rows.extend(stream.feed(chunk))
+            rows.extend(stream.close())
+            assert stream.found_table and rows == expected
+        # 워커가 모두 바쁘면 호출한 스레드에서 파싱
+        busy = [workers.stream((2026, 12)) for _ in range(2)]
+        assert isinstance(workers.stream((2026, 12)), main.FFRowStream)
+        for stream in busy:
+            stream.abort()
+    finally:
+        workers.close()
@@ -0,0 +1,72 @@
+"""FF 표시 zone 보정 — DST 전환 전후 (10/25 런던, 11/1 뉴욕) 에 걸친 행을 여러 FF zone 으로 렌더해서 비교."""
+import os
+import sys
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+TODAY = date(2026, 10, 1)
+
+# (FF 이름, 통화, 실제 발표 시각 — 지역 현지)
+RELEASES = [
+    ("CPI m/m", "USD", datetime(2026, 10, 14, 8, 30)),
+    ("CPI m/m", "USD", datetime(2026, 11, 12, 8, 30)),
+    ("Non-Farm Employment Change", "USD", datetime(2026, 11, 6, 8, 30)),
+    ("CPI y/y", "GBP", datetime(2026, 10, 21, 7, 0)),
+    ("CPI y/y", "GBP", datetime(2026, 11, 18, 7, 0)),
+    ("Manufacturing PMI", "CNY", datetime(2026, 10, 31, 9, 30)),
+    # 시간 미정 지표 (FF 시각 그대로 사용)
+    ("Fed Chair Warsh Speaks", "USD", datetime(2026, 10, 28, 13, 0)),
+    ("Fed Chair Warsh Speaks", "USD", datetime(2026, 11, 17, 10, 0)),
+    ("BOJ Policy Rate", "JPY", datetime(2026, 10, 30, 12, 0)),
+]
+
+
+def ff_rows(ff_zone: str):
+    """실제 발표 시각 → FF 가 ff_zone 으로 보여주는 행 + 기대 ET 시각."""
+    rows, expected = [], {}
+    for name, cur, local in RELEASES:
+        begin = local.replace(tzinfo=ZoneInfo(main.REGIONS[cur]))
+        shown = begin.astimezone(ZoneInfo(ff_zone))
+        text = f"{shown.hour % 12 or 12}:{shown.minute:02d}{'am' if shown.hour < 12 else 'pm'}"
+        rows.append((shown.date(), cur, name, text, "", "", ""))
+        expected[(name, shown.date())] = begin.astimezone(ZoneInfo("America/New_York"))
+    return rows, expected
+
+
+ZONES = ["America/New_York", "Asia/Hong_Kong", "UTC", "Europe/London", "Asia/Tokyo"]
+
+
+@pytest.mark.parametrize("ff_zone", ZONES)
+def test_live_path(ff_zone, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_FILE", str(tmp_path / "store.db"))
+    rows, expected = ff_rows(ff_zone)
+    zone = main.calibrate_ff_zone([rows], TODAY)
+    candidates, _, _ = main.page_candidates(rows, None, zone, TODAY)
+    got = {(c[2], c[5]): main.ET_TZ.convert(main.tz_table(c[7]).localize(c[0])) for c in candidates}
+    assert got == expected
+    # 예: Fed Chair 13:00 EDT → 13:00 ET, BoJ 12:00 JST → 전날 23:00 EDT
+    assert got[next(k for k in got if k[0] == "BOJ Policy Rate")].hour == 23
+
+
+def test_cached_zone(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DB_FILE", str(tmp_path / "store.db"))
+    rows, _ = ff_rows("Asia/Tokyo")
+    assert main.calibrate_ff_zone([rows], TODAY) == "Asia/Tokyo"
+    timeless = [r for r in rows if "Fed Chair" in r[2] or "BOJ" in r[2]]
+    assert main.calibrate_ff_zone([timeless], TODAY) == "Asia/Tokyo"
+    monkeypatch.setattr(main, "DB_FILE", str(tmp_path / "empty.db"))
+    assert main.calibrate_ff_zone([timeless], TODAY) == main.ET_TZ.name
+
+
+@pytest.mark.parametrize("ff_zone", ZONES)
+def test_backfill_path(ff_zone):
+    pd = pytest.importorskip("pandas")
+    rows, expected = ff_rows(ff_zone)
+    events = main.classify_frame(pd.DataFrame(rows, columns=main.FF_ROW_COLUMNS))
+    got = {(r.ff_name, r.ff_date): r.begin_et.to_pydatetime() for r in events.itertuples()}
+    assert got == expected
@@ -0,0 +1,99 @@
+"""--shared 협업 수집 — 여러 프로세스가 같은 공유 디렉터리로 shared_pages 실행 (가짜 fetch)."""
+import multiprocessing
+import os
+import sys
+import time
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+MONTHS = [(2026, 10), (2026, 11), (2026, 12), (2027, 1)]
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="fork 필요"
+)
+
+
+def runner(shared, log, ok, out, settings):
+    """자식 프로세스: shared_pages 로 MONTHS 수집 → {ym: rows} 를 out 으로."""
+    for name, value in settings.items():
+        setattr(main, name, value)
+    main.set_shared_dir(shared)
+
+    def fetch(ym, on_row=None):
+        with open(log, "a") as f:
+            f.write(f"{os.getpid()} {ym[0]}-{ym[1]:02d}\n")
+        time.sleep(0.2)
+        if not ok:
+            return None
+        return [(date(*ym, 1), "USD", f"CPI m/m {ym}", "8:30am", "", "", "")]
+
+    out.put({ym: rows for ym, rows in main.shared_pages(fetch, MONTHS)})
+
+
+def run(tmp_path, n, ok=True, **settings):
+    ctx = multiprocessing.get_context("fork")
+    out = ctx.Queue()
+    procs = [
+        ctx.Process(target=runner, args=(str(tmp_path / "shared"), str(tmp_path / "fetch.log"), ok, out, settings))
+        for _ in range(n)
+    ]
+    for p in procs:
+        p.start()
+    results = [out.get(timeout=60) for _ in procs]
+    for p in procs:
+        p.join(10)
+        assert p.exitcode == 0
+    return results
+
+
+def fetched(tmp_path):
+    try:
+        with open(tmp_path / "fetch.log") as f:
+            return [line.split()[1] for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def test_each_month_fetched_once(tmp_path):
+    results = run(tmp_path, 4, LEASE_POLL_SEC=0.05)
+    assert sorted(fetched(tmp_path)) == [f"{y}-{m:02d}" for y, m in MONTHS]
+    assert all(r == results[0] for r in results)
+    assert all(results[0][ym] for ym in MONTHS)
+
+
+def test_failure_record_expires(tmp_path):
+    fast = {"LEASE_POLL_SEC": 0.05, "SHARED_FAIL_SEC": 1.0}
+    assert all(rows is None for rows in run(tmp_path, 2, ok=False, **fast)[0].values())
+    assert len(fetched(tmp_path)) == len(MONTHS)
+
+    # 실패 기록이 유효한 동안은 다시 받지 않음
+    assert all(rows is None for rows in run(tmp_path, 1, **fast)[0].values())
+    assert len(fetched(tmp_path)) == len(MONTHS)
+
+    # 만료 후에는 다른 runner 가 lease 를 잡고 다시 받음
+    time.sleep(1.1)
+    assert all(run(tmp_path, 2, **fast)[0].values())
+    assert len(fetched(tmp_path)) == 2 * len(MONTHS)
+
+
+def test_expired_lease_recovered(tmp_path):
+    # 죽은 runner 가 잡고 있던 lease
+    main.set_shared_dir(str(tmp_path / "shared"))
+    try:
+        for ym in MONTHS[:2]:
+            path = main.shared_path("leases", ym, "lock")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("dead-host:1")
+    finally:
+        main.set_shared_dir(None)
+
+    t0 = time.time()
+    results = run(tmp_path, 3, LEASE_SEC=1.0, LEASE_POLL_SEC=0.05)
+    assert time.time() - t0 >= 1.0
+    assert sorted(fetched(tmp_path)) == [f"{y}-{m:02d}" for y, m in MONTHS]
+    assert all(r == results[0] and all(r.values()) for r in results)
@@ -0,0 +1,25 @@
+"""시작 속도 — render / serve 는 무거운 의존성 없이 STARTUP_BUDGET_MS 안에 import."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import main  # noqa: E402
+
+HEAVY = ["yfinance", "pandas", "cloudscraper"]
+
+
+@pytest.mark.parametrize("cmd", sorted(main.STARTUP_BUDGET_MS))
+def test_import_time_budget(cmd):
+    ms = min(main.import_time_ms(main.COMMAND_DEPS[cmd]) for _ in range(3))
+    assert 0 < ms <= main.STARTUP_BUDGET_MS[cmd]
+
+
+def test_import_main_skips_heavy_modules():
+    # 새 인터프리터 — 이 프로세스는 다른 테스트가 이미 pandas 등을 import 했을 수 있음
+    code = f"import sys, main; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert proc.stdout.split() == []
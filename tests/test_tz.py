@@ -0,0 +1,71 @@
+"""TzTable DST 경계 검증 — pytz localize(is_dst=False) / zoneinfo 변환과 비교."""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+CASES = [
+    # (zone, 벽시계) — 없는 시각 (spring forward) / 겹치는 시각 (fall back) / 평범한 시각
+    ("America/New_York", datetime(2026, 3, 8, 2, 30)),
+    ("America/New_York", datetime(2026, 3, 8, 1, 59)),
+    ("America/New_York", datetime(2026, 3, 8, 3, 0)),
+    ("America/New_York", datetime(2026, 11, 1, 1, 30)),
+    ("America/New_York", datetime(2026, 11, 1, 0, 59)),
+    ("America/New_York", datetime(2026, 11, 1, 2, 0)),
+    ("Europe/London", datetime(2026, 3, 29, 1, 30)),
+    ("Europe/London", datetime(2026, 10, 25, 1, 30)),
+    ("Asia/Hong_Kong", datetime(2026, 7, 1, 9, 0)),
+]
+
+
+@pytest.mark.parametrize("zone,wall", CASES)
+def test_localize_matches_pytz(zone, wall):
+    got = main.TzTable(zone).localize(wall)
+    ref = pytz.timezone(zone)
+    # 없는 시각은 pytz 도 같은 순간 — normalize 하면 벽시계 / 약어까지 같음 (02:30 EST → 03:30 EDT)
+    want = ref.normalize(ref.localize(wall, is_dst=False))
+    assert got == want
+    assert got.utcoffset() == want.utcoffset()
+    assert got.replace(tzinfo=None) == want.replace(tzinfo=None)
+    assert got.tzname() == want.tzname()
+
+
+@pytest.mark.parametrize("zone,day", [
+    ("America/New_York", datetime(2026, 3, 8)),
+    ("America/New_York", datetime(2026, 11, 1)),
+    ("Europe/London", datetime(2026, 3, 29)),
+    ("Europe/London", datetime(2026, 10, 25)),
+])
+def test_convert_matches_zoneinfo(zone, day):
+    table, zi = main.TzTable(zone), ZoneInfo(zone)
+    start = day.replace(tzinfo=timezone.utc) - timedelta(hours=12)
+    instants = [start + timedelta(minutes=15 * i) for i in range(4 * 36)]
+    for got, inst in zip(table.convert_many(instants), instants):
+        want = inst.astimezone(zi)
+        # 겹치는 시각의 zone 간 == 는 PEP 495 상 항상 False → 순간은 timestamp 로 비교
+        assert got.timestamp() == inst.timestamp()
+        assert got.utcoffset() == want.utcoffset()
+        assert got.replace(tzinfo=None) == want.replace(tzinfo=None)
+
+
+def test_concurrent_builds_stay_consistent():
+    # 여러 스레드가 같은 표를 서로 다른 연도로 넓히는 중에도 결과가 pytz 와 같아야 함
+    table, ref = main.TzTable("America/New_York"), pytz.timezone("America/New_York")
+    walls = [datetime(y, m, 8, 2, 30) for y in range(1990, 2060) for m in (3, 11)]
+
+    def work(offset):
+        chunk = walls[offset::8]
+        return [(w, table.localize(w)) for w in reversed(chunk)]
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        for results in ex.map(work, range(8)):
+            for wall, got in results:
+                assert got == ref.localize(wall, is_dst=False)